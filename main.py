@@ -148,7 +148,7 @@ Examples:
     try:
         # Initialize RAG system
         print("Initializing Privacy-Enhanced RAG System...")
-        rag = PrivacyEnhancedRAG(config_path=args.config)
+        rag = PrivacyEnhancedRAG(config_path=args.config, warmup=args.command == 'interactive')
         print("✓ System initialized successfully\n")
 
         if args.command == 'ingest':
@@ -17,6 +17,8 @@ import os
 import sys
 from pathlib import Path
 
+import numpy as np
+
 try:
     import torch
     from transformers import AutoTokenizer, AutoModelForCausalLM
@@ -37,7 +39,7 @@ def now_ms():
     return int(time.time() * 1000)
 
 
-def measure_inference(model, tokenizer, prompt, device, runs=10, warmup=2, max_new_tokens=64):
+def measure_inference(model, tokenizer, prompt, device, runs=10, warmup=2, max_new_tokens=64, profile_memory=True):
     # Prepare input ids
     inputs = tokenizer(prompt, return_tensors="pt")
     input_ids = inputs.input_ids.to(device if device in ['cpu','cuda'] else 'cpu')
@@ -47,47 +49,84 @@ def measure_inference(model, tokenizer, prompt, device, runs=10, warmup=2, max_n
         with torch.no_grad():
             _ = model.generate(input_ids, max_new_tokens=max_new_tokens, do_sample=False)
 
-    # Measure
-    times = []
-    proc = psutil.Process() if _HAS_PSUTIL else None
-    peak_cpu_rss = 0 if _HAS_PSUTIL else None
+    # Measure (per-run nanoseconds from the monotonic high-resolution clock)
+    times = np.empty(runs, dtype=np.int64)
+    sample_rss = profile_memory and _HAS_PSUTIL
+    proc = psutil.Process() if sample_rss else None
+    peak_cpu_rss = 0 if sample_rss else None
+    # peak_gpu_bytes stays 0 when GPU memory is not tracked (CPU runs, --no-profile-memory)
     peak_gpu_mem = 0
-    if device == 'cuda' and torch.cuda.is_available():
+    track_gpu = profile_memory and device == 'cuda' and torch.cuda.is_available()
+    if track_gpu:
         torch.cuda.reset_peak_memory_stats()
 
     for i in range(runs):
-        t0 = time.time()
+        t0 = time.perf_counter_ns()
         with torch.no_grad():
             _ = model.generate(input_ids, max_new_tokens=max_new_tokens, do_sample=False)
-        dt = (time.time() - t0) * 1000.0
-        times.append(dt)
-        # sample memory
-        if _HAS_PSUTIL:
+        times[i] = time.perf_counter_ns() - t0
+        # sample memory (procfs read per run; skipped when profile_memory=False)
+        if sample_rss:
             rss = proc.memory_info().rss
             if rss > peak_cpu_rss:
                 peak_cpu_rss = rss
-        if device == 'cuda' and torch.cuda.is_available():
-            current = torch.cuda.max_memory_allocated()
-            if current > peak_gpu_mem:
-                peak_gpu_mem = current
 
-    avg = sum(times) / len(times) if times else None
-    p50 = sorted(times)[len(times)//2] if times else None
+    # torch tracks the peak itself, so one read after the loop is enough
+    if track_gpu:
+        peak_gpu_mem = torch.cuda.max_memory_allocated()
+
+    times_ms = times / 1e6
+    has_runs = times_ms.size > 0
     return {
-        'times_ms': times,
-        'avg_ms': avg,
-        'p50_ms': p50,
+        'times_ms': times_ms.tolist(),
+        'avg_ms': float(times_ms.mean()) if has_runs else None,
+        'min_ms': float(times_ms.min()) if has_runs else None,
+        'max_ms': float(times_ms.max()) if has_runs else None,
+        'p50_ms': float(np.median(times_ms)) if has_runs else None,
+        'p99_ms': float(np.percentile(times_ms, 99)) if has_runs else None,
         'peak_cpu_rss_bytes': peak_cpu_rss,
         'peak_gpu_bytes': peak_gpu_mem
     }
 
 
-def run_bitsandbytes_benchmark(model_path, device, runs, warmup):
+def load_causal_lm(model_path, attn_implementation='sdpa', **kwargs):
+    """Load a causal LM with the requested attention backend, falling back to SDPA, then the default"""
+    candidates = [attn_implementation]
+    if attn_implementation != 'sdpa':
+        candidates.append('sdpa')
+    candidates.append(None)
+
+    last_error = None
+    for impl in candidates:
+        try:
+            extra = {'attn_implementation': impl} if impl else {}
+            model = AutoModelForCausalLM.from_pretrained(model_path, **kwargs, **extra)
+            print(f'Attention backend: {impl or "default"}')
+            return model
+        except (ImportError, ValueError, TypeError) as e:
+            # FA2 not installed / unsupported by this model or transformers version
+            print(f'Attention backend {impl or "default"} unavailable: {e}')
+            last_error = e
+    raise last_error
+
+
+def cuda_compute_dtype():
+    """Pick the half-precision compute dtype for the current GPU.
+
+    Ampere and newer (compute capability >= 8.0) run bfloat16 at the same
+    speed as float16 without fp16 overflow in softmax/norm, so prefer it there.
+    """
+    if torch.cuda.is_available() and torch.cuda.get_device_capability()[0] >= 8:
+        return torch.bfloat16
+    return torch.float16
+
+
+def run_bitsandbytes_benchmark(model_path, device, runs, warmup, attn_implementation='sdpa', profile_memory=True):
     # Check dependencies
     try:
         import transformers
         import bitsandbytes as bnb
-        from transformers import AutoTokenizer, AutoModelForCausalLM
+        from transformers import AutoTokenizer, AutoModelForCausalLM, BitsAndBytesConfig
     except Exception as e:
         print("Missing required packages for bitsandbytes workflow. Install with:\n  pip install transformers bitsandbytes accelerate")
         raise
@@ -107,10 +146,10 @@ def run_bitsandbytes_benchmark(model_path, device, runs, warmup):
     print('\n== Baseline: attempt loading full-precision model (may OOM) ==')
     try:
         baseline_device = torch.device('cuda' if use_cuda else 'cpu')
-        model_fp = AutoModelForCausalLM.from_pretrained(model_path, torch_dtype=torch.float32, device_map='auto' if use_cuda else None)
+        model_fp = load_causal_lm(model_path, attn_implementation, torch_dtype=torch.float32, device_map='auto' if use_cuda else None)
         model_fp.eval()
         print('Running baseline benchmark...')
-        res_fp = measure_inference(model_fp, tokenizer, "This is a test prompt.", 'cuda' if use_cuda else 'cpu', runs=runs, warmup=warmup)
+        res_fp = measure_inference(model_fp, tokenizer, "This is a test prompt.", 'cuda' if use_cuda else 'cpu', runs=runs, warmup=warmup, profile_memory=profile_memory)
         results['baseline'] = res_fp
         del model_fp
         if use_cuda:
@@ -123,14 +162,20 @@ def run_bitsandbytes_benchmark(model_path, device, runs, warmup):
     # 4-bit: load with load_in_4bit (requires bitsandbytes + compatible transformers)
     print('\n== 4-bit load via bitsandbytes (load_in_4bit=True) ==')
     try:
-        model_4bit = AutoModelForCausalLM.from_pretrained(
+        compute_dtype = cuda_compute_dtype() if use_cuda else torch.float32
+        print(f'4-bit compute dtype: {compute_dtype}')
+        model_4bit = load_causal_lm(
             model_path,
-            load_in_4bit=True,
+            attn_implementation,
+            quantization_config=BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=compute_dtype,
+            ),
             device_map='auto' if use_cuda else None,
-            torch_dtype=torch.float16 if use_cuda else torch.float32,
+            torch_dtype=compute_dtype,
         )
         model_4bit.eval()
-        res_4b = measure_inference(model_4bit, tokenizer, "This is a test prompt.", 'cuda' if use_cuda else 'cpu', runs=runs, warmup=warmup)
+        res_4b = measure_inference(model_4bit, tokenizer, "This is a test prompt.", 'cuda' if use_cuda else 'cpu', runs=runs, warmup=warmup, profile_memory=profile_memory)
         results['4bit'] = res_4b
         del model_4bit
         if use_cuda:
@@ -148,6 +193,10 @@ def parse_args():
     p.add_argument('--device', type=str, choices=['cpu', 'cuda'], default='cpu')
     p.add_argument('--runs', type=int, default=6, help='Number of timed runs')
     p.add_argument('--warmup', type=int, default=2, help='Number of warmup runs')
+    p.add_argument('--attn-implementation', type=str, choices=['flash_attention_2', 'sdpa', 'eager'], default='sdpa',
+                   help='Attention backend (falls back to sdpa, then the model default, if unavailable)')
+    p.add_argument('--no-profile-memory', dest='profile_memory', action='store_false',
+                   help='Skip per-run RSS / GPU peak memory sampling (latency only)')
     return p.parse_args()
 
 
@@ -163,7 +212,7 @@ def main():
     print('Starting bitsandbytes 4-bit benchmark. This will try to load models and measure latency & memory.')
 
     try:
-        results = run_bitsandbytes_benchmark(model_path, args.device, args.runs, args.warmup)
+        results = run_bitsandbytes_benchmark(model_path, args.device, args.runs, args.warmup, args.attn_implementation, args.profile_memory)
         print('\n=== Benchmark results ===')
         import json
         print(json.dumps(results, indent=2))
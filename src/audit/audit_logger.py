@@ -3,8 +3,12 @@ Audit Logger for tracking system operations
 审计日志记录器，用于跟踪系统操作
 """
 
+import sys
 import json
 import hashlib
+import atexit
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -12,6 +16,39 @@ import logging
 from loguru import logger
 
 
+# One background writer shared by every async AuditLogger (started on first use),
+# so instances own no thread or atexit hook and can be garbage-collected
+_writer_queue: Optional[queue.Queue] = None
+_writer_lock = threading.Lock()
+
+
+def _get_writer_queue() -> queue.Queue:
+    """Return the shared writer queue, starting its thread on first call"""
+    global _writer_queue
+    with _writer_lock:
+        if _writer_queue is None:
+            _writer_queue = queue.Queue()
+            threading.Thread(target=_drain, args=(_writer_queue,), name='audit-logger', daemon=True).start()
+            atexit.register(_writer_queue.join)
+        return _writer_queue
+
+
+def _drain(events: queue.Queue) -> None:
+    """Background writer loop for async_logging"""
+    while True:
+        write, level, prefix, event = events.get()
+        try:
+            write(level, prefix, event)
+        except Exception as e:
+            # Never drop an audit event silently; stderr is the last resort
+            print(
+                f"audit-logger: failed to write {prefix} event {event!r}: {e!r}",
+                file=sys.stderr
+            )
+        finally:
+            events.task_done()
+
+
 class AuditLogger:
     """Logger for auditing system operations without storing sensitive data"""
     
@@ -21,7 +58,8 @@ class AuditLogger:
         log_level: str = "INFO",
         include_query_metadata: bool = True,
         exclude_sensitive_data: bool = True,
-        integrity_check: bool = True
+        integrity_check: bool = True,
+        async_logging: bool = False
     ):
         """
         Initialize the AuditLogger
@@ -32,6 +70,13 @@ class AuditLogger:
             include_query_metadata: Whether to include query metadata
             exclude_sensitive_data: Whether to exclude sensitive data
             integrity_check: Whether to include integrity checksums
+            async_logging: Serialize, checksum and write events on a background
+                thread so log calls return immediately (call flush() before
+                relying on the log contents). The file sink's enqueue=True only
+                moves the file write off the caller; this also moves the JSON
+                encoding and checksum. The line's {time} is then when the entry
+                was written; the event's own 'timestamp' field is still when it
+                happened.
         """
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -61,6 +106,9 @@ class AuditLogger:
         )
         
         self.logger = logger
+        
+        self._queue = _get_writer_queue() if async_logging else None
+        
         self._log_system_start()
     
     def _log_system_start(self) -> None:
@@ -97,13 +145,10 @@ class AuditLogger:
         if error:
             event['error'] = error
         
-        if self.integrity_check:
-            event['checksum'] = self._calculate_checksum(event)
-        
         if success:
-            self.logger.info(f"Document ingestion: {json.dumps(event)}")
+            self._emit("INFO", "Document ingestion", event)
         else:
-            self.logger.error(f"Document ingestion failed: {json.dumps(event)}")
+            self._emit("ERROR", "Document ingestion failed", event)
     
     def log_query(
         self,
@@ -139,13 +184,10 @@ class AuditLogger:
         if error:
             event['error'] = error
         
-        if self.integrity_check:
-            event['checksum'] = self._calculate_checksum(event)
-        
         if success:
-            self.logger.info(f"Query processed: {json.dumps(event)}")
+            self._emit("INFO", "Query processed", event)
         else:
-            self.logger.error(f"Query failed: {json.dumps(event)}")
+            self._emit("ERROR", "Query failed", event)
     
     def log_encryption_operation(
         self,
@@ -169,10 +211,7 @@ class AuditLogger:
             'success': success
         }
         
-        if self.integrity_check:
-            event['checksum'] = self._calculate_checksum(event)
-        
-        self.logger.info(f"Encryption operation: {json.dumps(event)}")
+        self._emit("INFO", "Encryption operation", event)
     
     def log_system_event(
         self,
@@ -194,17 +233,7 @@ class AuditLogger:
             **details
         }
         
-        if self.integrity_check:
-            event['checksum'] = self._calculate_checksum(event)
-        
-        log_message = f"System event: {json.dumps(event)}"
-        
-        if level == "WARNING":
-            self.logger.warning(log_message)
-        elif level == "ERROR":
-            self.logger.error(log_message)
-        else:
-            self.logger.info(log_message)
+        self._emit(level if level in ("WARNING", "ERROR") else "INFO", "System event", event)
     
     def log_security_event(
         self,
@@ -225,15 +254,32 @@ class AuditLogger:
             'severity': severity
         }
         
-        if self.integrity_check:
-            event['checksum'] = self._calculate_checksum(event)
-        
         if severity in ["HIGH", "CRITICAL"]:
-            self.logger.error(f"Security event: {json.dumps(event)}")
+            self._emit("ERROR", "Security event", event)
         elif severity == "MEDIUM":
-            self.logger.warning(f"Security event: {json.dumps(event)}")
+            self._emit("WARNING", "Security event", event)
+        else:
+            self._emit("INFO", "Security event", event)
+    
+    def _emit(self, level: str, prefix: str, event: Dict[str, Any]) -> None:
+        """Write an event now, or hand it to the background writer"""
+        if self._queue is not None:
+            self._queue.put((self._write, level, prefix, event))
         else:
-            self.logger.info(f"Security event: {json.dumps(event)}")
+            self._write(level, prefix, event)
+    
+    def _write(self, level: str, prefix: str, event: Dict[str, Any]) -> None:
+        """Add the integrity checksum and write the event"""
+        if self.integrity_check:
+            event['checksum'] = self._calculate_checksum(event)
+        
+        self.logger.log(level, f"{prefix}: {json.dumps(event)}")
+    
+    def flush(self) -> None:
+        """Block until all queued events (of every async logger) have been written to the log sinks"""
+        if self._queue is not None:
+            self._queue.join()
+        self.logger.complete()
     
     def _calculate_checksum(self, event: Dict[str, Any]) -> str:
         """
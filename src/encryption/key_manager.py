@@ -4,13 +4,27 @@ Key Manager for generating and managing encryption keys
 """
 
 import os
+import hashlib
+import functools
 from pathlib import Path
-from typing import Tuple
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.backends import default_backend
+from typing import Tuple, Dict, List
 import secrets
 
+# Loaded keys by file identity; a changed mtime/size/inode misses naturally
+_KEY_CACHE: Dict[Tuple[str, int, int, int], bytes] = {}
+
+
+@functools.lru_cache(maxsize=64)
+def _derive_cached(password_bytes: bytes, salt: bytes) -> bytes:
+    """
+    PBKDF2-HMAC-SHA256 (100k iterations), memoized per (password, salt)
+    
+    Note: cached derivations keep the password and derived key in process
+    memory for the lifetime of the cache; call _derive_cached.cache_clear()
+    to drop them.
+    """
+    return hashlib.pbkdf2_hmac('sha256', password_bytes, salt, 100000, dklen=32)
+
 
 class KeyManager:
     """Manages encryption keys for the system"""
@@ -34,6 +48,19 @@ class KeyManager:
         """
         return secrets.token_bytes(32)  # 256 bits
     
+    def generate_keys(self, n: int) -> List[bytes]:
+        """
+        Generate several 256-bit keys from a single entropy read
+        
+        Args:
+            n: Number of keys to generate
+        
+        Returns:
+            list: n independent 32-byte encryption keys
+        """
+        buf = os.urandom(32 * n)
+        return [buf[i * 32:(i + 1) * 32] for i in range(n)]
+    
     def save_key(self, key: bytes) -> None:
         """
         Save encryption key to file
@@ -48,6 +75,11 @@ class KeyManager:
         with open(self.key_file_path, 'wb') as f:
             f.write(key)
         
+        # Drop cached copies in case the rewrite keeps the same mtime
+        path = str(self.key_file_path.resolve())
+        for cache_key in [k for k in _KEY_CACHE if k[0] == path]:
+            del _KEY_CACHE[cache_key]
+        
         # Set file permissions to read/write for owner only (Unix-like systems)
         if os.name != 'nt':  # Not Windows
             os.chmod(self.key_file_path, 0o600)
@@ -68,8 +100,13 @@ class KeyManager:
                 "Please generate a key first using generate_and_save_key()"
             )
         
-        with open(self.key_file_path, 'rb') as f:
-            return f.read()
+        stat = self.key_file_path.stat()
+        cache_key = (str(self.key_file_path.resolve()), stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        key = _KEY_CACHE.get(cache_key)
+        if key is None:
+            key = self.key_file_path.read_bytes()
+            _KEY_CACHE[cache_key] = key
+        return key
     
     def generate_and_save_key(self) -> bytes:
         """
@@ -96,6 +133,9 @@ class KeyManager:
         """
         Derive an encryption key from a password using PBKDF2
         
+        Repeated derivations with the same password and salt are served from
+        an in-process cache.
+        
         Args:
             password: The password to derive the key from
             salt: Optional salt bytes (will be generated if not provided)
@@ -106,13 +146,5 @@ class KeyManager:
         if salt is None:
             salt = secrets.token_bytes(16)
         
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-            backend=default_backend()
-        )
-        
-        key = kdf.derive(password.encode())
+        key = _derive_cached(password.encode(), bytes(salt))
         return key, salt
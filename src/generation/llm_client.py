@@ -3,10 +3,20 @@ LLM Client for generating responses using Ollama
 LLM客户端，使用Ollama生成响应
 """
 
+import time
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Union
 import json
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
 
 class LLMClient:
     """Client for interacting with Ollama LLM"""
@@ -17,7 +27,10 @@ class LLMClient:
         model_name: str = "llama2:7b",
         temperature: float = 0.7,
         max_tokens: int = 512,
-        top_p: float = 0.9
+        top_p: float = 0.9,
+        max_workers: int = 4,
+        conn_ttl: float = 10.0,
+        keep_alive: Optional[str] = "30m"
     ):
         """
         Initialize the LLM client
@@ -28,17 +41,39 @@ class LLMClient:
             temperature: Sampling temperature
             max_tokens: Maximum tokens to generate
             top_p: Top-p sampling parameter
+            max_workers: Concurrent requests used by generate_batch
+            conn_ttl: Seconds to reuse check_connection/list_models results (0 disables)
+            keep_alive: How long Ollama keeps the model loaded after a request
+                (e.g. "30m"; None uses the server default)
         """
         self.base_url = base_url.rstrip('/')
         self.model_name = model_name
         self.temperature = temperature
         self.max_tokens = max_tokens
         self.top_p = top_p
+        self.max_workers = max_workers
+        self.conn_ttl = conn_ttl
+        self.keep_alive = keep_alive
+        
+        # (monotonic timestamp, value) of the last health check / model listing
+        self._conn_cache = None
+        self._models_cache = None
+        
+        # Reuse keep-alive connections across calls instead of reconnecting each time
+        self._session = requests.Session()
+        # Keep at least one pooled socket per generate_batch worker
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(16, max_workers))
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+    
+    def close(self) -> None:
+        """Close pooled HTTP connections"""
+        self._session.close()
     
     def generate(
         self,
         prompt: str,
-        context: Optional[List[str]] = None,
+        context: Optional[Union[str, List[str]]] = None,
         stream: bool = False
     ) -> str:
         """
@@ -46,7 +81,8 @@ class LLMClient:
         
         Args:
             prompt: User prompt/question
-            context: Optional context chunks to provide
+            context: Optional context chunks, or a context string already
+                built with format_context
             stream: Whether to stream the response
         
         Returns:
@@ -61,6 +97,7 @@ class LLMClient:
             "model": self.model_name,
             "prompt": full_prompt,
             "stream": stream,
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": self.temperature,
                 "num_predict": self.max_tokens,
@@ -69,39 +106,86 @@ class LLMClient:
         }
         
         try:
-            response = requests.post(url, json=data, timeout=120)
+            response = self._session.post(url, json=data, timeout=120)
             response.raise_for_status()
             
             if stream:
                 # Handle streaming response
-                full_response = ""
+                parts: List[str] = []
                 for line in response.iter_lines():
                     if line:
-                        json_response = json.loads(line)
+                        json_response = _json_loads(line)
                         if 'response' in json_response:
-                            full_response += json_response['response']
+                            parts.append(json_response['response'])
                         if json_response.get('done', False):
                             break
-                return full_response
+                return ''.join(parts)
             else:
                 # Handle non-streaming response
-                result = response.json()
+                result = _json_loads(response.content)
                 return result.get('response', '')
         
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError: non-JSON body (e.g. a proxy error page), as response.json() used to report
             raise ConnectionError(f"Failed to connect to Ollama: {e}")
     
+    def generate_batch(
+        self,
+        prompts: List[str],
+        contexts: Optional[List[Optional[Union[str, List[str]]]]] = None,
+        max_workers: Optional[int] = None
+    ) -> List[str]:
+        """
+        Generate responses for independent prompts concurrently
+        
+        Args:
+            prompts: User prompts/questions
+            contexts: Optional per-prompt context chunks or pre-formatted strings
+                (same length as prompts)
+            max_workers: Concurrent requests (defaults to the client setting)
+        
+        Returns:
+            list: Generated responses, in the same order as prompts
+        """
+        if contexts is None:
+            contexts = [None] * len(prompts)
+        if len(contexts) != len(prompts):
+            raise ValueError("prompts and contexts must have the same length")
+        
+        workers = min(max_workers or self.max_workers, len(prompts))
+        if workers <= 1:
+            return [self.generate(p, c) for p, c in zip(prompts, contexts)]
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.generate, prompts, contexts))
+    
+    @staticmethod
+    def format_context(chunks: List[str], max_chars_per_chunk: Optional[int] = None) -> str:
+        """
+        Number and join context chunks into the prompt's context block
+        
+        Args:
+            chunks: Context chunks, most relevant first
+            max_chars_per_chunk: Truncate each chunk to this many characters (no limit if None)
+        
+        Returns:
+            str: Context text
+        """
+        if max_chars_per_chunk is not None:
+            chunks = [chunk[:max_chars_per_chunk] for chunk in chunks]
+        return "\n\n".join([f"[{i+1}] {chunk}" for i, chunk in enumerate(chunks)])
+    
     def _build_prompt_with_context(
         self,
         question: str,
-        context: Optional[List[str]] = None
+        context: Optional[Union[str, List[str]]] = None
     ) -> str:
         """
         Build prompt with context for RAG
         
         Args:
             question: User question
-            context: List of context chunks
+            context: List of context chunks, or an already formatted context string
         
         Returns:
             str: Formatted prompt
@@ -109,8 +193,8 @@ class LLMClient:
         if not context:
             return question
         
-        # Format context
-        context_text = "\n\n".join([f"[{i+1}] {chunk}" for i, chunk in enumerate(context)])
+        # Format context (pre-joined strings are used as-is)
+        context_text = context if isinstance(context, str) else self.format_context(context)
         
         # Build RAG prompt
         prompt = f"""Based on the following context, please answer the question.
@@ -124,6 +208,20 @@ Answer (based on the context provided):"""
         
         return prompt
     
+    def preload(self) -> bool:
+        """
+        Ask Ollama to load the model into memory without generating
+        
+        Returns:
+            bool: True if the server accepted the request, False otherwise
+        """
+        try:
+            url = f"{self.base_url}/api/generate"
+            response = self._session.post(url, json={"model": self.model_name, "keep_alive": self.keep_alive}, timeout=120)
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
+            return False
+    
     def check_connection(self) -> bool:
         """
         Check if Ollama server is accessible
@@ -131,12 +229,20 @@ Answer (based on the context provided):"""
         Returns:
             bool: True if server is accessible, False otherwise
         """
+        if self._conn_cache and time.monotonic() - self._conn_cache[0] < self.conn_ttl:
+            return self._conn_cache[1]
+        
         try:
             url = f"{self.base_url}/api/tags"
-            response = requests.get(url, timeout=5)
-            return response.status_code == 200
+            response = self._session.get(url, timeout=5)
+            connected = response.status_code == 200
         except requests.exceptions.RequestException:
-            return False
+            connected = False
+        
+        # Only successes are cached so a restarted server is seen on the next call
+        if connected:
+            self._conn_cache = (time.monotonic(), True)
+        return connected
     
     def list_models(self) -> List[str]:
         """
@@ -145,15 +251,22 @@ Answer (based on the context provided):"""
         Returns:
             list: List of model names
         """
+        if self._models_cache and time.monotonic() - self._models_cache[0] < self.conn_ttl:
+            return list(self._models_cache[1])
+        
         try:
             url = f"{self.base_url}/api/tags"
-            response = requests.get(url, timeout=5)
+            response = self._session.get(url, timeout=5)
             response.raise_for_status()
             
-            data = response.json()
-            return [model['name'] for model in data.get('models', [])]
-        except requests.exceptions.RequestException:
+            data = _json_loads(response.content)
+            models = [model['name'] for model in data.get('models', [])]
+        except (requests.exceptions.RequestException, ValueError):
             return []
+        
+        # Only successful listings are cached so a restarted server is seen promptly
+        self._models_cache = (time.monotonic(), models)
+        return list(models)
     
     def chat(
         self,
@@ -175,6 +288,7 @@ Answer (based on the context provided):"""
             "model": self.model_name,
             "messages": messages,
             "stream": stream,
+            "keep_alive": self.keep_alive,
             "options": {
                 "temperature": self.temperature,
                 "num_predict": self.max_tokens,
@@ -183,22 +297,23 @@ Answer (based on the context provided):"""
         }
         
         try:
-            response = requests.post(url, json=data, timeout=120)
+            response = self._session.post(url, json=data, timeout=120)
             response.raise_for_status()
             
             if stream:
-                full_response = ""
+                parts: List[str] = []
                 for line in response.iter_lines():
                     if line:
-                        json_response = json.loads(line)
+                        json_response = _json_loads(line)
                         if 'message' in json_response and 'content' in json_response['message']:
-                            full_response += json_response['message']['content']
+                            parts.append(json_response['message']['content'])
                         if json_response.get('done', False):
                             break
-                return full_response
+                return ''.join(parts)
             else:
-                result = response.json()
+                result = _json_loads(response.content)
                 return result.get('message', {}).get('content', '')
         
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError: non-JSON body (e.g. a proxy error page), as response.json() used to report
             raise ConnectionError(f"Failed to connect to Ollama: {e}")
@@ -4,10 +4,14 @@ Main RAG System integrating all components
 """
 
 import time
-import uuid
+import secrets
 import os
-from typing import Dict, Any, List
+from collections import OrderedDict
+from functools import cached_property
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple, Callable
 from pathlib import Path
+import numpy as np
 from qdrant_client.models import Distance
 
 from .encryption import EncryptionManager
@@ -16,16 +20,32 @@ from .generation import LLMClient
 from .audit import AuditLogger
 from .utils import ConfigLoader, DocumentProcessor
 
+NO_ANSWER_MESSAGE = "I couldn't find relevant information to answer your question."
+
+_DISTANCE_MAP = {
+    'COSINE': Distance.COSINE,
+    'EUCLID': Distance.EUCLID,
+    'DOT': Distance.DOT
+}
+
+# Collection info type -> function converting it to a dict (see _normalize_collection_info)
+_INFO_CONVERTERS: Dict[type, Callable[[Any], Dict[str, Any]]] = {}
+
 
 class PrivacyEnhancedRAG:
     """Privacy-Enhanced Lightweight RAG System"""
     
-    def __init__(self, config_path: str = "config/config.yaml"):
+    # Chunks embedded, encrypted and stored per step in ingest_document
+    INGEST_BATCH_SIZE = 256
+    
+    def __init__(self, config_path: str = "config/config.yaml", warmup: bool = False):
         """
         Initialize the RAG system
         
         Args:
             config_path: Path to configuration file
+            warmup: Run a throwaway embedding and preload the LLM so the
+                first query does not pay model load / device init costs
         """
         # Load configuration
         self.config = ConfigLoader(config_path)
@@ -37,7 +57,8 @@ class PrivacyEnhancedRAG:
             log_level=audit_config.get('log_level', 'INFO'),
             include_query_metadata=audit_config.get('include_query_metadata', True),
             exclude_sensitive_data=audit_config.get('exclude_sensitive_data', True),
-            integrity_check=audit_config.get('integrity_check', True)
+            integrity_check=audit_config.get('integrity_check', True),
+            async_logging=audit_config.get('async_logging', False)
         )
         
         # Initialize encryption
@@ -46,7 +67,37 @@ class PrivacyEnhancedRAG:
             key_file=enc_config.get('key_file', 'config/encryption.key')
         )
         
-        # Initialize embedding model
+        # Embedding model, vector store and LLM client are built lazily on first
+        # access (see the properties below), so lightweight commands skip model
+        # loads and network setup
+        self._embed_batch_size = self.config.get_section('embedding').get('batch_size', 32)
+
+        # Initialize document processor
+        doc_config = self.config.get_section('document_processing')
+        self.document_processor = DocumentProcessor(
+            chunk_size=doc_config.get('chunk_size', 500),
+            chunk_overlap=doc_config.get('chunk_overlap', 50),
+            cache_dir=doc_config.get('cache_dir')
+        )
+
+        # Get retrieval configuration
+        self.retrieval_config = self.config.get_section('retrieval')
+
+        # LRU of decrypted chunk text keyed by vector store point id (0 disables)
+        self._plaintext_cache: "OrderedDict[Any, str]" = OrderedDict()
+        self._plaintext_cache_size = self.retrieval_config.get('plaintext_cache_size', 4096)
+
+        self.audit_logger.log_system_event(
+            'system_initialization',
+            {'status': 'success', 'components': 'all'}
+        )
+
+        if warmup:
+            self.warmup()
+
+    @cached_property
+    def embedding_model(self) -> EmbeddingModel:
+        """Embedding model, loaded on first use"""
         emb_config = self.config.get_section('embedding')
         # Support config keys: 'model' (HuggingFace id or local path), optional 'local_model_path', and 'offline'
         model_name = emb_config.get('model') or emb_config.get('model_name') or 'sentence-transformers/all-MiniLM-L6-v2'
@@ -73,15 +124,22 @@ class PrivacyEnhancedRAG:
             os.environ.setdefault("HF_DATASETS_OFFLINE", "1")
             os.environ.setdefault("HUGGINGFACE_HUB_OFFLINE", "1")
 
-        self.embedding_model = EmbeddingModel(
+        return EmbeddingModel(
             model_name=model_name,
             device=emb_config.get('device', 'cpu'),
             max_seq_length=emb_config.get('max_seq_length', 256),
             local_model_path=local_model_path,
-            offline=offline_flag
+            offline=offline_flag,
+            cache_dir=emb_config.get('cache_dir'),
+            query_cache_size=emb_config.get('query_cache_size', 1024),
+            compile=emb_config.get('compile', False),
+            backend=emb_config.get('backend', 'torch'),
+            model_file_name=emb_config.get('model_file_name')
         )
-        
-        # Initialize vector store
+
+    @cached_property
+    def vector_store(self) -> VectorStore:
+        """Vector store client, connected on first use"""
         vdb_config = self.config.get_section('vector_db')
         # support nested qdrant config: vector_db.qdrant
         q_cfg = vdb_config.get('qdrant', {}) if isinstance(vdb_config, dict) else {}
@@ -89,52 +147,56 @@ class PrivacyEnhancedRAG:
         host = q_cfg.get('host', vdb_config.get('host', '127.0.0.1'))
         port = q_cfg.get('port', vdb_config.get('port', 6333))
         storage_path = q_cfg.get('storage_path') or vdb_config.get('storage_path') or None
-        distance_map = {
-            'COSINE': Distance.COSINE,
-            'EUCLID': Distance.EUCLID,
-            'DOT': Distance.DOT
-        }
         distance_str = (q_cfg.get('distance') or vdb_config.get('distance') or 'COSINE').upper()
-        distance = distance_map.get(distance_str, Distance.COSINE)
+        distance = _DISTANCE_MAP.get(distance_str, Distance.COSINE)
+        # Embeddings are always L2-normalized at encode time, so DOT ranks and scores
+        # exactly like COSINE without Qdrant re-normalizing vectors
+        if distance == Distance.COSINE:
+            distance = Distance.DOT
+
+        # A configured vector_size avoids loading the embedding model just to read its dimension
+        vector_size = q_cfg.get('vector_size') or vdb_config.get('vector_size')
+        if vector_size is None:
+            vector_size = self.embedding_model.get_embedding_dimension()
 
         # If a storage path is provided, pass it to VectorStore (VectorStore will choose client mode)
-        self.vector_store = VectorStore(
+        return VectorStore(
             collection_name=collection_name,
             host=host,
             port=port,
             path=storage_path,
-            vector_size=self.embedding_model.get_embedding_dimension(),
-            distance=distance
+            vector_size=vector_size,
+            distance=distance,
+            datatype=q_cfg.get('datatype') or vdb_config.get('datatype'),
+            quantization=q_cfg.get('quantization') or vdb_config.get('quantization')
         )
-        
-        # Initialize LLM client
+
+    @cached_property
+    def llm_client(self) -> LLMClient:
+        """Ollama client, created on first use"""
         llm_config = self.config.get_section('llm')
         # support nested llm.ollama config
         ollama_cfg = llm_config.get('ollama', {}) if isinstance(llm_config, dict) else {}
         base_url = ollama_cfg.get('host') or llm_config.get('base_url') or 'http://localhost:11434'
         llm_model_name = ollama_cfg.get('model') or llm_config.get('model_name') or 'llama3.2:3b'
-        self.llm_client = LLMClient(
+        return LLMClient(
             base_url=base_url,
             model_name=llm_model_name,
             temperature=ollama_cfg.get('temperature', llm_config.get('temperature', 0.1)),
             max_tokens=ollama_cfg.get('max_tokens', llm_config.get('max_tokens', 1024)),
-            top_p=ollama_cfg.get('top_p', llm_config.get('top_p', 0.95))
-        )
-
-        # Initialize document processor
-        doc_config = self.config.get_section('document_processing')
-        self.document_processor = DocumentProcessor(
-            chunk_size=doc_config.get('chunk_size', 500),
-            chunk_overlap=doc_config.get('chunk_overlap', 50)
+            top_p=ollama_cfg.get('top_p', llm_config.get('top_p', 0.95)),
+            max_workers=ollama_cfg.get('max_workers', llm_config.get('max_workers', 4)),
+            conn_ttl=ollama_cfg.get('conn_ttl', llm_config.get('conn_ttl', 10.0)),
+            keep_alive=ollama_cfg.get('keep_alive', llm_config.get('keep_alive', '30m'))
         )
 
-        # Get retrieval configuration
-        self.retrieval_config = self.config.get_section('retrieval')
-
-        self.audit_logger.log_system_event(
-            'system_initialization',
-            {'status': 'success', 'components': 'all'}
-        )
+    def warmup(self) -> None:
+        """Trigger lazy model/device initialization ahead of the first query"""
+        try:
+            self.embedding_model.encode(["warmup"])
+            self.llm_client.preload()
+        except Exception as e:
+            self.audit_logger.log_system_event('warmup', {'status': 'failed', 'error': str(e)}, level='WARNING')
 
     def ingest_document(self, file_path: str) -> Dict[str, Any]:
         """
@@ -146,6 +208,8 @@ class PrivacyEnhancedRAG:
         Returns:
             dict: Ingestion result with statistics
         """
+        file_name = Path(file_path).name if file_path else 'unknown'
+
         try:
             # Process document
             chunks = self.document_processor.process_document(file_path)
@@ -153,49 +217,16 @@ class PrivacyEnhancedRAG:
             if not chunks:
                 raise ValueError("No chunks created from document")
 
-            # Extract texts
-            texts = [chunk['text'] for chunk in chunks]
-
-            # Generate embeddings (ensure a list of vectors)
-            embeddings = list(self.embedding_model.encode(texts, show_progress_bar=True))
-
-            # Encrypt texts
-            encrypted_data = []
-            nonces = []
-
-            for text in texts:
-                encrypted_base64 = self.encryption_manager.encrypt_to_base64(text)
-                encrypted_data.append(encrypted_base64)
-                # Nonce is embedded in the base64-encoded ciphertext, so we pass None as placeholder
-                nonces.append(None)
+            doc_ids = self._store_chunks(chunks)
 
             # Log encryption operation
             self.audit_logger.log_encryption_operation(
                 operation='encrypt',
-                num_items=len(texts),
+                num_items=len(chunks),
                 success=True
             )
 
-            # Prepare metadata
-            metadata = [
-                {
-                    'source': chunk['source'],
-                    'chunk_id': chunk['id'],
-                    'file_path': chunk['file_path']
-                }
-                for chunk in chunks
-            ]
-
-            # Store in vector database
-            doc_ids = self.vector_store.add_documents(
-                embeddings=embeddings,
-                encrypted_texts=encrypted_data,
-                nonces=nonces,
-                metadata=metadata
-            )
-
             # Log successful ingestion
-            file_name = Path(file_path).name
             self.audit_logger.log_document_ingestion(
                 file_name=file_name,
                 num_chunks=len(chunks),
@@ -211,7 +242,6 @@ class PrivacyEnhancedRAG:
 
         except Exception as e:
             # Log failed ingestion
-            file_name = Path(file_path).name if file_path else 'unknown'
             self.audit_logger.log_document_ingestion(
                 file_name=file_name,
                 num_chunks=0,
@@ -220,6 +250,164 @@ class PrivacyEnhancedRAG:
             )
             raise
 
+    def _store_chunks(self, chunks: List[Dict[str, Any]]) -> List[str]:
+        """
+        Embed, encrypt and store chunks in INGEST_BATCH_SIZE batches
+
+        Peak memory stays bounded and the first points reach the store early.
+        If any batch fails, points already written are deleted before the
+        error propagates, so a failed ingestion leaves nothing behind.
+
+        Returns:
+            list: Document IDs in chunk order
+        """
+        doc_ids: List[str] = []
+        try:
+            for start in range(0, len(chunks), self.INGEST_BATCH_SIZE):
+                batch = chunks[start:start + self.INGEST_BATCH_SIZE]
+
+                # Extract texts
+                texts = [chunk['text'] for chunk in batch]
+
+                # Embed and encrypt concurrently (one contiguous float32 array, rows passed straight to the store)
+                # The nonce is embedded in the base64-encoded ciphertext, so no nonces list is stored
+                embeddings, encrypted_data = self._embed_and_encrypt(texts, self._embed_batch_size)
+
+                # Prepare metadata
+                metadata = [
+                    {
+                        'source': chunk['source'],
+                        'chunk_id': chunk['id'],
+                        'file_path': chunk['file_path']
+                    }
+                    for chunk in batch
+                ]
+
+                # Store in vector database
+                doc_ids.extend(self.vector_store.add_documents(
+                    embeddings=embeddings,
+                    encrypted_texts=encrypted_data,
+                    metadata=metadata
+                ))
+        except Exception:
+            if doc_ids:
+                try:
+                    self.vector_store.delete_documents(doc_ids)
+                except Exception as e:
+                    self.audit_logger.log_system_event(
+                        'ingest_rollback_failed',
+                        {'num_points': len(doc_ids), 'error': str(e)},
+                        level='ERROR'
+                    )
+            raise
+
+        return doc_ids
+
+    def _embed_and_encrypt(self, texts: List[str], batch_size: int) -> Tuple[np.ndarray, List[str]]:
+        """
+        Embed and encrypt chunk texts at the same time
+
+        The encoder (torch) and AES-GCM (OpenSSL) both release the GIL and use
+        separate resources, so the wall time is roughly the slower of the two.
+
+        Returns:
+            tuple: (embeddings array, base64 ciphertexts)
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            embed_future = executor.submit(
+                self.embedding_model.encode_documents,
+                texts,
+                batch_size=batch_size,
+                show_progress_bar=True
+            )
+            encrypt_future = executor.submit(self.encryption_manager.encrypt_many, texts)
+            return embed_future.result(), encrypt_future.result()
+
+    def ingest_directory(self, directory: str, max_workers: int = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Ingest every supported document under a directory
+
+        Files are parsed and chunked concurrently, then the chunks of all
+        files are embedded, encrypted and stored in bounded batches.
+
+        Args:
+            directory: Root directory to scan recursively
+            max_workers: Number of parser threads (executor default if None)
+
+        Returns:
+            dict: Mapping of file path to its ingestion result
+        """
+        file_paths = self.document_processor.list_documents(directory)
+        results = {}
+
+        # Parse + chunk files in parallel (I/O-bound)
+        parsed = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (file_path, executor.submit(self.document_processor.process_document, file_path))
+                for file_path in file_paths
+            ]
+            for file_path, future in futures:
+                try:
+                    chunks = future.result()
+                    if not chunks:
+                        raise ValueError("No chunks created from document")
+                    parsed.append((file_path, chunks))
+                except Exception as e:
+                    results[file_path] = {
+                        'status': 'error',
+                        'file_name': Path(file_path).name,
+                        'error': str(e)
+                    }
+                    self.audit_logger.log_document_ingestion(
+                        file_name=Path(file_path).name,
+                        num_chunks=0,
+                        success=False,
+                        error=str(e)
+                    )
+
+        if not parsed:
+            return results
+
+        all_chunks = [chunk for _, chunks in parsed for chunk in chunks]
+
+        try:
+            doc_ids = self._store_chunks(all_chunks)
+
+            self.audit_logger.log_encryption_operation(
+                operation='encrypt',
+                num_items=len(all_chunks),
+                success=True
+            )
+        except Exception as e:
+            for file_path, _ in parsed:
+                self.audit_logger.log_document_ingestion(
+                    file_name=Path(file_path).name,
+                    num_chunks=0,
+                    success=False,
+                    error=str(e)
+                )
+            raise
+
+        # Split the flat id list back into per-file results
+        offset = 0
+        for file_path, chunks in parsed:
+            file_name = Path(file_path).name
+            self.audit_logger.log_document_ingestion(
+                file_name=file_name,
+                num_chunks=len(chunks),
+                success=True
+            )
+            results[file_path] = {
+                'status': 'success',
+                'file_name': file_name,
+                'num_chunks': len(chunks),
+                'document_ids': doc_ids[offset:offset + len(chunks)]
+            }
+            offset += len(chunks)
+
+        return results
+
     def query(self, question: str, top_k: int = None) -> Dict[str, Any]:
         """
         Query the RAG system
@@ -231,7 +419,7 @@ class PrivacyEnhancedRAG:
         Returns:
             dict: Response with answer and metadata
         """
-        query_id = str(uuid.uuid4())
+        query_id = secrets.token_hex(16)
 
         if top_k is None:
             top_k = self.retrieval_config.get('top_k', 3)
@@ -240,62 +428,31 @@ class PrivacyEnhancedRAG:
 
         try:
             # Phase 1: Retrieval
-            retrieval_start = time.time()
+            retrieval_start = time.perf_counter()
 
             # Generate query embedding
             query_embedding = self.embedding_model.encode_single(question)
 
-            # Search vector store
-            search_results = self.vector_store.search(
-                query_embedding=query_embedding,
-                top_k=top_k,
-                score_threshold=score_threshold
+            # Search vector store and decrypt retrieved texts
+            search_results, context_texts, sources = self._retrieve(
+                query_embedding, top_k, score_threshold
             )
 
-            # Decrypt retrieved texts
-            decrypted_chunks: List[Dict[str, Any]] = []
-            for result in search_results:
-                try:
-                    decrypted_text = self.encryption_manager.decrypt_from_base64(
-                        result['encrypted_text']
-                    )
-                    decrypted_chunks.append({
-                        'text': decrypted_text,
-                        'score': result['score'],
-                        'metadata': result['metadata']
-                    })
-                except Exception as e:
-                    self.audit_logger.log_system_event(
-                        'decryption_error',
-                        {'error': str(e)},
-                        level='ERROR'
-                    )
-
-            retrieval_time = time.time() - retrieval_start
-
-            # Log decryption operation
-            self.audit_logger.log_encryption_operation(
-                operation='decrypt',
-                num_items=len(decrypted_chunks),
-                success=True
-            )
+            retrieval_time = time.perf_counter() - retrieval_start
 
             # Phase 2: Generation
-            generation_start = time.time()
+            generation_start = time.perf_counter()
 
-            if not decrypted_chunks:
-                answer = "I couldn't find relevant information to answer your question."
+            if not context_texts:
+                answer = NO_ANSWER_MESSAGE
             else:
-                # Extract context texts
-                context_texts = [chunk['text'] for chunk in decrypted_chunks]
-
                 # Generate answer
                 answer = self.llm_client.generate(
                     prompt=question,
-                    context=context_texts
+                    context=self._format_context(context_texts)
                 )
 
-            generation_time = time.time() - generation_start
+            generation_time = time.perf_counter() - generation_start
 
             # Log query
             self.audit_logger.log_query(
@@ -311,8 +468,7 @@ class PrivacyEnhancedRAG:
                 'query_id': query_id,
                 'answer': answer,
                 'retrieved_chunks': len(search_results),
-                'sources': [chunk['metadata'].get('source', 'unknown')
-                          for chunk in decrypted_chunks],
+                'sources': sources,
                 'retrieval_time': retrieval_time,
                 'generation_time': generation_time,
                 'total_time': retrieval_time + generation_time
@@ -330,6 +486,186 @@ class PrivacyEnhancedRAG:
             )
             raise
 
+    def query_batch(self, questions: List[str], top_k: int = None) -> List[Dict[str, Any]]:
+        """
+        Query the RAG system with several questions at once
+
+        Questions are embedded in a single encode call and answers are
+        generated concurrently via the LLM client.
+
+        Args:
+            questions: User questions
+            top_k: Number of documents to retrieve per question (uses config default if None)
+
+        Returns:
+            list: One response per question, in the same format as query().
+                Timings are the batch phase durations divided evenly.
+        """
+        if not questions:
+            return []
+
+        query_ids = [secrets.token_hex(16) for _ in questions]
+
+        if top_k is None:
+            top_k = self.retrieval_config.get('top_k', 3)
+
+        score_threshold = self.retrieval_config.get('score_threshold', 0.5)
+
+        try:
+            # Phase 1: Retrieval (one encode call for all questions)
+            retrieval_start = time.perf_counter()
+
+            # SentenceTransformer length-sorts inside the call, so one large batch keeps padding low
+            query_embeddings = self.embedding_model.encode(questions, batch_size=min(len(questions), 64))
+            # One search_batch request instead of a round trip per question
+            retrieved = [
+                self._decrypt_hits(search_results)
+                for search_results in self.vector_store.search_batch(
+                    query_embeddings, top_k=top_k, score_threshold=score_threshold
+                )
+            ]
+
+            retrieval_time = (time.perf_counter() - retrieval_start) / len(questions)
+
+            # Phase 2: Generation (concurrent requests for questions with context)
+            generation_start = time.perf_counter()
+
+            answers = [NO_ANSWER_MESSAGE] * len(questions)
+            pending = [i for i, (_, texts, _) in enumerate(retrieved) if texts]
+            if pending:
+                generated = self.llm_client.generate_batch(
+                    [questions[i] for i in pending],
+                    [self._format_context(retrieved[i][1]) for i in pending]
+                )
+                for i, answer in zip(pending, generated):
+                    answers[i] = answer
+
+            generation_time = (time.perf_counter() - generation_start) / len(questions)
+
+        except Exception as e:
+            for query_id in query_ids:
+                self.audit_logger.log_query(
+                    query_id=query_id,
+                    num_results=0,
+                    retrieval_time=0,
+                    generation_time=0,
+                    success=False,
+                    error=str(e)
+                )
+            raise
+
+        results = []
+        for query_id, answer, (search_results, _, sources) in zip(query_ids, answers, retrieved):
+            self.audit_logger.log_query(
+                query_id=query_id,
+                num_results=len(search_results),
+                retrieval_time=retrieval_time,
+                generation_time=generation_time,
+                success=True
+            )
+            results.append({
+                'status': 'success',
+                'query_id': query_id,
+                'answer': answer,
+                'retrieved_chunks': len(search_results),
+                'sources': sources,
+                'retrieval_time': retrieval_time,
+                'generation_time': generation_time,
+                'total_time': retrieval_time + generation_time
+            })
+
+        return results
+
+    def _format_context(self, context_texts: List[str]) -> str:
+        """
+        Join retrieved chunks into one context string for the LLM
+
+        If retrieval.max_context_chars is set, the budget is split evenly
+        across the chunks and each is truncated before the join. The budget
+        is approximate: the "[n] " prefixes and separators are not counted,
+        and every chunk keeps at least one character.
+        """
+        max_chars = self.retrieval_config.get('max_context_chars')
+        per_chunk = max(1, max_chars // len(context_texts)) if max_chars and context_texts else None
+        return self.llm_client.format_context(context_texts, per_chunk)
+
+    def _retrieve(
+        self,
+        query_embedding: np.ndarray,
+        top_k: int,
+        score_threshold: float
+    ) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+        """
+        Search the vector store and decrypt the hits
+
+        Returns:
+            tuple: (raw search results, decrypted context texts, their sources);
+                the last two are parallel lists without failed decryptions
+        """
+        search_results = self.vector_store.search(
+            query_embedding=query_embedding,
+            top_k=top_k,
+            score_threshold=score_threshold
+        )
+        return self._decrypt_hits(search_results)
+
+    def _decrypt_hits(
+        self,
+        search_results: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+        """
+        Decrypt search hits through the plaintext cache
+
+        Logs one 'decrypt' audit event whose num_items counts only the chunks
+        actually decrypted here; cache hits are not decrypted and not counted.
+
+        Returns:
+            tuple: same shape as _retrieve()
+        """
+        # Serve hot chunks from the plaintext cache, decrypt only the misses
+        cache = self._plaintext_cache
+        texts = [cache.get(result['id']) for result in search_results]
+        misses = [i for i, text in enumerate(texts) if text is None]
+
+        errors: Dict[int, Exception] = {}
+        if misses:
+            decrypted = self.encryption_manager.decrypt_many(
+                [search_results[i]['encrypted_text'] for i in misses],
+                errors=errors
+            )
+            for e in errors.values():
+                self.audit_logger.log_system_event(
+                    'decryption_error',
+                    {'error': str(e)},
+                    level='ERROR'
+                )
+            for i, text in zip(misses, decrypted):
+                texts[i] = text
+                if text is not None and self._plaintext_cache_size > 0:
+                    cache[search_results[i]['id']] = text
+
+        for result, text in zip(search_results, texts):
+            if text is not None and result['id'] in cache:
+                cache.move_to_end(result['id'])
+        while len(cache) > self._plaintext_cache_size:
+            cache.popitem(last=False)
+
+        self.audit_logger.log_encryption_operation(
+            operation='decrypt',
+            num_items=len(misses) - len(errors),
+            success=not errors
+        )
+
+        # One pass builds both parallel output lists
+        context_texts: List[str] = []
+        sources: List[str] = []
+        for result, text in zip(search_results, texts):
+            if text is not None:
+                context_texts.append(text)
+                sources.append(result['metadata'].get('source', 'unknown'))
+
+        return search_results, context_texts, sources
+
     def get_collection_info(self) -> Dict[str, Any]:
         """
         Get information about the document collection
@@ -350,32 +686,16 @@ class PrivacyEnhancedRAG:
         Normalize various forms of collection info returned by different qdrant-client
         versions into a stable dict with keys: name, points_count, vectors_count, status, _raw
         """
-        data = None
-        # Try pydantic .dict()
+        # The response type is fixed for a given qdrant-client version, so the
+        # conversion strategy is chosen once per type and reused
+        convert = _INFO_CONVERTERS.get(type(info))
+        if convert is None:
+            convert = self._select_info_converter(info)
+            _INFO_CONVERTERS[type(info)] = convert
         try:
-            if hasattr(info, 'dict'):
-                data = info.dict()
+            data = convert(info)
         except Exception:
-            data = None
-
-        # Fallback to __dict__
-        if data is None:
-            try:
-                if hasattr(info, '__dict__'):
-                    data = dict(info.__dict__)
-            except Exception:
-                data = None
-
-        # If it's already a dict
-        if data is None and isinstance(info, dict):
-            data = info
-
-        # Final fallback to vars()
-        if data is None:
-            try:
-                data = dict(vars(info))
-            except Exception:
-                data = {}
+            data = {}
 
         def pick(*keys):
             for k in keys:
@@ -419,6 +739,27 @@ class PrivacyEnhancedRAG:
             '_raw': data,
         }
 
+    @staticmethod
+    def _select_info_converter(info: Any) -> Callable[[Any], Dict[str, Any]]:
+        """Pick the first working dict conversion for a collection info object"""
+        candidates = [
+            # pydantic .dict()
+            lambda i: i.dict(),
+            # __dict__
+            lambda i: dict(i.__dict__),
+            # already a dict
+            lambda i: i if isinstance(i, dict) else None,
+            # vars()
+            lambda i: dict(vars(i)),
+        ]
+        for candidate in candidates:
+            try:
+                if candidate(info) is not None:
+                    return candidate
+            except Exception:
+                continue
+        return lambda i: {}
+
     def check_llm_connection(self) -> bool:
         """
         Check if LLM server is accessible
@@ -431,6 +772,7 @@ class PrivacyEnhancedRAG:
     def delete_collection(self) -> None:
         """Delete all documents from the collection"""
         self.vector_store.delete_collection()
+        self._plaintext_cache.clear()
         self.audit_logger.log_system_event(
             'collection_deleted',
             {'status': 'success'}
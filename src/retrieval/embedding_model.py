@@ -4,11 +4,25 @@ Embedding Model for generating vector representations
 """
 
 import os
+import functools
+import hashlib
+import sqlite3
+import threading
+import logging
 from sentence_transformers import SentenceTransformer
 from typing import List, Union, Optional
 import numpy as np
 import torch
 
+try:
+    import simsimd
+    _HAS_SIMSIMD = True
+except ImportError:
+    simsimd = None
+    _HAS_SIMSIMD = False
+
+logger = logging.getLogger(__name__)
+
 
 class EmbeddingModel:
     """Lightweight embedding model for text vectorization"""
@@ -19,7 +33,12 @@ class EmbeddingModel:
         device: str = "cpu",
         max_seq_length: int = 256,
         local_model_path: Optional[str] = None,
-        offline: bool = False
+        offline: bool = False,
+        cache_dir: Optional[str] = None,
+        query_cache_size: int = 1024,
+        compile: bool = False,
+        backend: str = "torch",
+        model_file_name: Optional[str] = None
     ):
         """
         Initialize the embedding model
@@ -30,12 +49,24 @@ class EmbeddingModel:
             max_seq_length: Maximum sequence length
             local_model_path: If provided, load the model from this local path (preferred for offline use)
             offline: If True, force transformers/huggingface clients to run in offline mode
+            cache_dir: Directory for an on-disk cache of document embeddings keyed by
+                content hash (disabled if None)
+            query_cache_size: Number of recent encode_single results kept in
+                memory (0 disables)
+            compile: Wrap the underlying transformer with torch.compile (PyTorch 2.x);
+                the first encodes are slower while graphs are compiled
+            backend: SentenceTransformer inference backend: 'torch', 'onnx' (ONNX
+                Runtime) or 'openvino'; needs sentence-transformers >= 3.2
+            model_file_name: Optional model file for the onnx/openvino backend, e.g.
+                'onnx/model_qint8_avx512_vnni.onnx' for an INT8-quantized export
         """
         self.model_name = model_name
         self.device = device
         self.max_seq_length = max_seq_length
         self.local_model_path = local_model_path
         self.offline = offline
+        self.backend = backend
+        self.model_file_name = model_file_name
 
         # If offline mode requested, set standard env vars so HF/transformers will not attempt network calls
         if self.offline:
@@ -59,7 +90,13 @@ class EmbeddingModel:
         # Load the SentenceTransformer model
         try:
             # SentenceTransformer accepts both HuggingFace ids and local folders
-            self.model = SentenceTransformer(load_target, device=device)
+            # Only pass backend options when requested so older sentence-transformers keep working
+            backend_kwargs = {}
+            if backend != "torch":
+                backend_kwargs['backend'] = backend
+                if model_file_name:
+                    backend_kwargs['model_kwargs'] = {'file_name': model_file_name}
+            self.model = SentenceTransformer(load_target, device=device, **backend_kwargs)
             self.model.max_seq_length = max_seq_length
         except Exception as e:
             # Provide a clearer error message to help with fully-offline setups
@@ -69,8 +106,49 @@ class EmbeddingModel:
                 "or set `offline=False` to allow downloads. Original error: " + str(e)
             )
 
+        # onnx/openvino backends have no torch module to compile
+        if compile and backend == "torch":
+            self._compile_transformer()
+        elif compile:
+            logger.warning("compile=True ignored for the %s backend", backend)
+
         # Get embedding dimension
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
+
+        # Optional SQLite cache so re-ingested chunks skip the encoder
+        self._cache_db = None
+        self._cache_lock = threading.Lock()
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._cache_db = sqlite3.connect(
+                os.path.join(cache_dir, 'embeddings.sqlite'),
+                check_same_thread=False
+            )
+            self._cache_db.execute(
+                'CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)'
+            )
+            self._cache_db.commit()
+        
+        # Per-instance LRU so repeated questions skip the forward pass
+        if query_cache_size > 0:
+            self._encode_single = functools.lru_cache(maxsize=query_cache_size)(self._encode_single)
+    
+    def _compile_transformer(self) -> None:
+        """Compile the HF module inside the first SentenceTransformer stage, if possible"""
+        if not hasattr(torch, 'compile'):
+            logger.warning("torch.compile unavailable (PyTorch < 2.0); embedding model left uncompiled")
+            return
+        transformer = self.model[0]
+        eager_model = transformer.auto_model
+        try:
+            # CUDA graphs only pay off on GPU; dynamic shapes avoid a recompile per batch length
+            mode = 'reduce-overhead' if str(self.device).startswith('cuda') else None
+            transformer.auto_model = torch.compile(eager_model, mode=mode, dynamic=True)
+            # Compilation is lazy; run one forward pass so failures surface here
+            self.model.encode(["warmup"], show_progress_bar=False)
+        except Exception as e:
+            transformer.auto_model = eager_model
+            logger.warning("torch.compile failed, using eager embedding model: %s", e)
     
     def encode(
         self,
@@ -104,6 +182,74 @@ class EmbeddingModel:
         
         return embeddings
     
+    def encode_documents(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        normalize: bool = True
+    ) -> np.ndarray:
+        """
+        Encode document chunks, reusing cached embeddings of previously seen texts
+        
+        Only cache misses go through the model; without a cache_dir this is
+        the same as encode(). Query texts should use encode() so they are
+        never written to disk.
+        
+        Args:
+            texts: List of chunk texts
+            batch_size: Batch size for encoding
+            show_progress_bar: Whether to show progress bar
+            normalize: Whether to normalize embeddings
+        
+        Returns:
+            np.ndarray: Embeddings of shape (n_texts, embedding_dim)
+        """
+        if self._cache_db is None:
+            return self.encode(texts, batch_size, show_progress_bar, normalize)
+        
+        keys = [self._cache_key(text, normalize) for text in texts]
+        cached = {}
+        with self._cache_lock:
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                rows = self._cache_db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(part))})",
+                    part
+                )
+                cached.update(rows)
+        
+        embeddings = np.empty((len(texts), self.embedding_dim), dtype=np.float32)
+        misses = [i for i, key in enumerate(keys) if key not in cached]
+        if misses:
+            fresh = self.encode([texts[i] for i in misses], batch_size, show_progress_bar, normalize)
+            embeddings[misses] = fresh
+            with self._cache_lock:
+                self._cache_db.executemany(
+                    'INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)',
+                    [(keys[i], np.asarray(vector, dtype=np.float32).tobytes())
+                     for i, vector in zip(misses, fresh)]
+                )
+                self._cache_db.commit()
+        
+        for i, key in enumerate(keys):
+            if key in cached:
+                embeddings[i] = np.frombuffer(cached[key], dtype=np.float32)
+        
+        return embeddings
+    
+    def _cache_key(self, text: str, normalize: bool) -> str:
+        """Content hash of a text, scoped to the model and encoding settings"""
+        h = hashlib.blake2b(digest_size=16)
+        # Backend and model file matter too: an ONNX/OpenVINO or INT8 export yields different vectors
+        h.update(
+            f"{self.local_model_path or self.model_name}\0{self.backend}\0{self.model_file_name or ''}\0"
+            f"{self.max_seq_length}\0{int(normalize)}\0".encode('utf-8')
+        )
+        h.update(text.encode('utf-8'))
+        return h.hexdigest()
+    
     def encode_single(self, text: str) -> np.ndarray:
         """
         Encode a single text into embedding
@@ -112,9 +258,15 @@ class EmbeddingModel:
             text: Input text
         
         Returns:
-            np.ndarray: Embedding vector
+            np.ndarray: Embedding vector (read-only; may be shared between calls)
         """
-        return self.encode(text)[0]
+        return self._encode_single(text)
+    
+    def _encode_single(self, text: str) -> np.ndarray:
+        """Uncached single-text encode; results are frozen so cached arrays stay intact"""
+        embedding = self.encode(text)[0]
+        embedding.setflags(write=False)
+        return embedding
     
     def get_embedding_dimension(self) -> int:
         """
@@ -136,16 +288,23 @@ class EmbeddingModel:
         Returns:
             float: Cosine similarity score
         """
-        # Normalize if not already normalized
-        embedding1 = embedding1 / np.linalg.norm(embedding1)
-        embedding2 = embedding2 / np.linalg.norm(embedding2)
+        # int8 products would overflow in NumPy's native integer arithmetic
+        if embedding1.dtype == np.int8:
+            embedding1 = embedding1.astype(np.float32)
+        if embedding2.dtype == np.int8:
+            embedding2 = embedding2.astype(np.float32)
         
-        return np.dot(embedding1, embedding2)
+        # One sqrt over the product of squared norms instead of two norm calls
+        return float(
+            np.dot(embedding1, embedding2)
+            / np.sqrt(np.vdot(embedding1, embedding1) * np.vdot(embedding2, embedding2))
+        )
     
     def batch_similarity(
         self,
         query_embedding: np.ndarray,
-        embeddings: np.ndarray
+        embeddings: np.ndarray,
+        assume_normalized: bool = False
     ) -> np.ndarray:
         """
         Calculate cosine similarity between query and multiple embeddings
@@ -153,12 +312,35 @@ class EmbeddingModel:
         Args:
             query_embedding: Query embedding of shape (embedding_dim,)
             embeddings: Array of embeddings of shape (n, embedding_dim)
+            assume_normalized: Skip normalization for unit vectors (encode() output)
         
         Returns:
-            np.ndarray: Array of similarity scores
+            np.ndarray: Array of similarity scores (0.0 where either vector is all zeros)
         """
-        # Normalize
-        query_embedding = query_embedding / np.linalg.norm(query_embedding)
-        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        # SimSIMD's hand-written cosine kernels fuse the dot product and norms
+        # (int8 inputs map to VNNI/dot-product instructions where available)
+        if not assume_normalized and _HAS_SIMSIMD and embeddings.dtype in (np.float32, np.float16, np.int8) and query_embedding.dtype == embeddings.dtype:
+            # The kernels need C-contiguous rows; a no-op for encode() output
+            query_embedding = np.ascontiguousarray(query_embedding)
+            embeddings = np.ascontiguousarray(embeddings)
+            # SimSIMD scores a zero query against a zero row as 1.0; keep 0.0 like the NumPy path
+            if not query_embedding.any():
+                return np.zeros(len(embeddings))
+            distances = simsimd.cdist(query_embedding[None, :], embeddings, metric='cosine')
+            return 1.0 - np.asarray(distances).ravel()
+        
+        # int8 products would overflow in NumPy's native integer arithmetic
+        if embeddings.dtype == np.int8:
+            embeddings = embeddings.astype(np.float32)
+        if query_embedding.dtype == np.int8:
+            query_embedding = query_embedding.astype(np.float32)
+        
+        if assume_normalized:
+            return embeddings @ query_embedding
         
-        return np.dot(embeddings, query_embedding)
+        # Row norms in one fused pass; divide the n scores rather than the n x d matrix
+        row_norms = np.sqrt(np.einsum('ij,ij->i', embeddings, embeddings))
+        query_norm = np.sqrt(np.vdot(query_embedding, query_embedding))
+        norms = row_norms * query_norm
+        # Zero-norm rows score 0.0 rather than nan
+        return np.divide(embeddings @ query_embedding, norms, out=np.zeros(len(norms)), where=norms > 0)
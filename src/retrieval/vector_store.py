@@ -3,10 +3,11 @@ Vector Store using Qdrant for storing and retrieving encrypted documents
 向量存储，使用Qdrant存储和检索加密文档
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
-from qdrant_client.models import Filter, FieldCondition, MatchValue
+from qdrant_client.models import Distance, VectorParams
+from qdrant_client.models import ScalarQuantization, ScalarQuantizationConfig, ScalarType
+from qdrant_client.models import Filter, FieldCondition, MatchValue, SearchRequest, PointIdsList
 import uuid
 import numpy as np
 
@@ -21,7 +22,9 @@ class VectorStore:
         port: int = 6333,
         path: str = None,
         vector_size: int = 384,
-        distance: Distance = Distance.COSINE
+        distance: Distance = Distance.COSINE,
+        datatype: Optional[str] = None,
+        quantization: Optional[str] = None
     ):
         """
         Initialize the VectorStore
@@ -33,6 +36,10 @@ class VectorStore:
             path: Path for local storage (if not using server)
             vector_size: Dimension of vectors
             distance: Distance metric (COSINE, EUCLID, DOT)
+            datatype: Storage datatype for new collections ('float16' halves
+                vector memory; None keeps Qdrant's float32 default)
+            quantization: 'int8' enables scalar quantization (kept in RAM, original
+                vectors used for rescoring) on new collections
         """
         self.collection_name = collection_name
         self.vector_size = vector_size
@@ -44,37 +51,59 @@ class VectorStore:
             self.client = QdrantClient(host=host, port=port)
         
         # Create collection if it doesn't exist
-        self._create_collection_if_not_exists(distance)
+        self._create_collection_if_not_exists(distance, datatype, quantization)
     
-    def _create_collection_if_not_exists(self, distance: Distance) -> None:
+    def _create_collection_if_not_exists(
+        self,
+        distance: Distance,
+        datatype: Optional[str] = None,
+        quantization: Optional[str] = None
+    ) -> None:
         """Create collection if it doesn't exist"""
         collections = self.client.get_collections().collections
         collection_names = [col.name for col in collections]
         
         if self.collection_name not in collection_names:
+            # Datatype.FLOAT16 needs qdrant-client >= 1.10; only touch it when asked,
+            # since older VectorParams reject the field altogether
+            vector_kwargs = {}
+            if datatype:
+                from qdrant_client.models import Datatype
+                vector_kwargs['datatype'] = Datatype(datatype.lower())
+            
             self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=VectorParams(
                     size=self.vector_size,
-                    distance=distance
-                )
+                    distance=distance,
+                    **vector_kwargs
+                ),
+                quantization_config=ScalarQuantization(
+                    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+                ) if quantization and quantization.lower() == 'int8' else None
             )
     
     def add_documents(
         self,
         embeddings: List[np.ndarray],
         encrypted_texts: List[str],
-        nonces: List[str],
-        metadata: List[Dict[str, Any]] = None
+        nonces: List[str] = None,
+        metadata: List[Dict[str, Any]] = None,
+        batch_size: int = 1024,
+        parallel: int = 1
     ) -> List[str]:
         """
         Add documents to the vector store
         
         Args:
-            embeddings: List of embedding vectors
+            embeddings: Embedding vectors (list of arrays or a 2-D array)
             encrypted_texts: List of encrypted texts (base64)
-            nonces: List of nonces used for encryption (base64)
+            nonces: Optional list of nonces used for encryption (base64); omit
+                when the nonce is embedded in the ciphertext
             metadata: Optional list of metadata dictionaries
+            batch_size: Points sent per upload request
+            parallel: Upload worker processes; only worth raising for very
+                large bulk loads against a server
         
         Returns:
             list: List of document IDs
@@ -82,37 +111,35 @@ class VectorStore:
         if metadata is None:
             metadata = [{}] * len(embeddings)
         
-        if not (len(embeddings) == len(encrypted_texts) == len(nonces) == len(metadata)):
+        if nonces is not None and len(nonces) != len(embeddings):
             raise ValueError("All input lists must have the same length")
         
-        points = []
-        ids = []
+        if not (len(embeddings) == len(encrypted_texts) == len(metadata)):
+            raise ValueError("All input lists must have the same length")
         
-        for i, (embedding, encrypted_text, nonce, meta) in enumerate(
-            zip(embeddings, encrypted_texts, nonces, metadata)
-        ):
-            doc_id = str(uuid.uuid4())
-            ids.append(doc_id)
-            
-            # Prepare payload with encrypted data and metadata
-            payload = {
-                'encrypted_text': encrypted_text,
-                'nonce': nonce,
-                **meta
-            }
-            
-            # Create point
-            point = PointStruct(
-                id=doc_id,
-                vector=embedding.tolist() if isinstance(embedding, np.ndarray) else embedding,
-                payload=payload
-            )
-            points.append(point)
+        if len(embeddings) == 0:
+            return []
+        
+        ids = [str(uuid.uuid4()) for _ in range(len(embeddings))]
+        
+        # Payload with encrypted data and metadata
+        payloads = [
+            {'encrypted_text': encrypted_text, **meta}
+            for encrypted_text, meta in zip(encrypted_texts, metadata)
+        ]
+        if nonces is not None:
+            for payload, nonce in zip(payloads, nonces):
+                payload['nonce'] = nonce
         
-        # Upload points to Qdrant
-        self.client.upsert(
+        # upload_collection takes the array as-is, no per-vector tolist()/PointStruct
+        self.client.upload_collection(
             collection_name=self.collection_name,
-            points=points
+            vectors=np.asarray(embeddings, dtype=np.float32),
+            payload=payloads,
+            ids=ids,
+            batch_size=batch_size,
+            parallel=parallel,
+            wait=True
         )
         
         return ids
@@ -154,7 +181,47 @@ class VectorStore:
             query_filter=query_filter
         )
         
-        # Format results
+        return self._format_results(results)
+    
+    def search_batch(
+        self,
+        query_embeddings: np.ndarray,
+        top_k: int = 5,
+        score_threshold: float = 0.0
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several queries in a single round trip
+        
+        Args:
+            query_embeddings: Query embedding vectors, one row per query
+            top_k: Number of results to return per query
+            score_threshold: Minimum similarity score
+        
+        Returns:
+            list: One result list per query, formatted as in search()
+        """
+        if len(query_embeddings) == 0:
+            return []
+        
+        requests = [
+            SearchRequest(
+                vector=embedding.tolist() if isinstance(embedding, np.ndarray) else list(embedding),
+                limit=top_k,
+                score_threshold=score_threshold,
+                with_payload=True
+            )
+            for embedding in query_embeddings
+        ]
+        batch_results = self.client.search_batch(
+            collection_name=self.collection_name,
+            requests=requests
+        )
+        
+        return [self._format_results(results) for results in batch_results]
+    
+    @staticmethod
+    def _format_results(results) -> List[Dict[str, Any]]:
+        """Convert scored points into result dicts"""
         formatted_results = []
         for result in results:
             formatted_results.append({
@@ -168,6 +235,20 @@ class VectorStore:
         
         return formatted_results
     
+    def delete_documents(self, ids: List[str]) -> None:
+        """
+        Delete documents by ID
+        
+        Args:
+            ids: Document IDs returned by add_documents
+        """
+        if not ids:
+            return
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=PointIdsList(points=list(ids))
+        )
+    
     def delete_collection(self) -> None:
         """Delete the collection"""
         self.client.delete_collection(collection_name=self.collection_name)
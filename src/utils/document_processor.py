@@ -3,28 +3,50 @@ Document Processor for parsing and chunking documents
 文档处理器，用于解析和切分文档
 """
 
+import io
+import os
 import re
+import hashlib
+import tempfile
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 import pypdf
 import docx
 import markdown
 from bs4 import BeautifulSoup
 
+try:
+    import xxhash
+    _HAS_XXHASH = True
+except ImportError:
+    xxhash = None
+    _HAS_XXHASH = False
+
 
 class DocumentProcessor:
     """Process and chunk documents for RAG system"""
     
-    def __init__(self, chunk_size: int = 500, chunk_overlap: int = 50):
+    SUPPORTED_FORMATS = ('.pdf', '.txt', '.docx', '.md', '.html', '.htm')
+    
+    def __init__(
+        self,
+        chunk_size: int = 500,
+        chunk_overlap: int = 50,
+        cache_dir: Optional[str] = None
+    ):
         """
         Initialize DocumentProcessor
         
         Args:
             chunk_size: Maximum size of each chunk in characters
             chunk_overlap: Overlap between consecutive chunks in characters
+            cache_dir: Optional directory for caching extracted text keyed by
+                file content hash. The cache stores plaintext, so only enable
+                it on trusted storage.
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.cache_dir = Path(cache_dir) if cache_dir else None
     
     def load_document(self, file_path: str) -> str:
         """
@@ -43,54 +65,78 @@ class DocumentProcessor:
         
         file_extension = path.suffix.lower()
         
+        if file_extension not in self.SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+        
+        # Read once; hashing and parsing both work from this in-memory buffer
+        data = path.read_bytes()
+        
+        if self.cache_dir is None:
+            return self._parse(data, file_extension)
+        
+        # Key on content (not path/mtime) so moved or renamed files still hit
+        cache_file = self.cache_dir / f"{self._content_hash(data)}{file_extension}.txt"
+        if cache_file.exists():
+            return cache_file.read_text(encoding='utf-8')
+        
+        text = self._parse(data, file_extension)
+        
+        # Write to a temp file and rename so readers never see partial entries
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Unique temp name: threads parsing identical content must not share one
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=self.cache_dir,
+            prefix=f"{cache_file.name}.", suffix='.tmp', delete=False
+        ) as tmp:
+            tmp.write(text)
+        os.replace(tmp.name, cache_file)
+        return text
+    
+    def _parse(self, data: bytes, file_extension: str) -> str:
+        """Dispatch to the loader for the given file extension"""
         if file_extension == '.pdf':
-            return self._load_pdf(path)
+            return self._load_pdf(data)
         elif file_extension == '.txt':
-            return self._load_txt(path)
+            return self._load_txt(data)
         elif file_extension == '.docx':
-            return self._load_docx(path)
+            return self._load_docx(data)
         elif file_extension == '.md':
-            return self._load_markdown(path)
+            return self._load_markdown(data)
         elif file_extension in ['.html', '.htm']:
-            return self._load_html(path)
+            return self._load_html(data)
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
     
-    def _load_pdf(self, path: Path) -> str:
-        """Load content from PDF file"""
-        text = ""
-        with open(path, 'rb') as f:
-            pdf_reader = pypdf.PdfReader(f)
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-        return text
+    @staticmethod
+    def _content_hash(data: bytes) -> str:
+        """Hash file contents (xxhash when available, blake2b otherwise)"""
+        if _HAS_XXHASH:
+            return xxhash.xxh64(data).hexdigest()
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
     
-    def _load_txt(self, path: Path) -> str:
-        """Load content from text file"""
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read()
+    def _load_pdf(self, data: bytes) -> str:
+        """Load content from PDF bytes"""
+        pdf_reader = pypdf.PdfReader(io.BytesIO(data))
+        return "".join(page.extract_text() + "\n" for page in pdf_reader.pages)
     
-    def _load_docx(self, path: Path) -> str:
-        """Load content from DOCX file"""
-        doc = docx.Document(path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+    def _load_txt(self, data: bytes) -> str:
+        """Load content from text bytes"""
+        return data.decode('utf-8')
+    
+    def _load_docx(self, data: bytes) -> str:
+        """Load content from DOCX bytes"""
+        doc = docx.Document(io.BytesIO(data))
+        return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
     
-    def _load_markdown(self, path: Path) -> str:
-        """Load content from Markdown file"""
-        with open(path, 'r', encoding='utf-8') as f:
-            md_text = f.read()
-        html = markdown.markdown(md_text)
+    def _load_markdown(self, data: bytes) -> str:
+        """Load content from Markdown bytes"""
+        html = markdown.markdown(data.decode('utf-8'))
         soup = BeautifulSoup(html, 'html.parser')
         return soup.get_text()
     
-    def _load_html(self, path: Path) -> str:
-        """Load content from HTML file"""
-        with open(path, 'r', encoding='utf-8') as f:
-            html = f.read()
-        soup = BeautifulSoup(html, 'html.parser')
+    def _load_html(self, data: bytes) -> str:
+        """Load content from HTML bytes"""
+        soup = BeautifulSoup(data.decode('utf-8'), 'html.parser')
         return soup.get_text()
     
     def chunk_text(self, text: str) -> List[Dict[str, any]]:
@@ -141,6 +187,31 @@ class DocumentProcessor:
         
         return chunks
     
+    def list_documents(self, directory: str) -> List[str]:
+        """
+        Find supported documents under a directory
+        
+        Args:
+            directory: Root directory to scan recursively
+        
+        Returns:
+            list: File paths, largest first so long parses start early
+        """
+        if not os.path.isdir(directory):
+            raise NotADirectoryError(f"Directory not found: {directory}")
+        
+        exts = set(self.SUPPORTED_FORMATS)
+        files = []
+        # Single walk with in-process extension filtering
+        for root, _, names in os.walk(directory):
+            for name in names:
+                if os.path.splitext(name)[1].lower() in exts:
+                    path = os.path.join(root, name)
+                    files.append((os.path.getsize(path), path))
+        
+        files.sort(key=lambda item: item[0], reverse=True)
+        return [path for _, path in files]
+    
     def _clean_text(self, text: str) -> str:
         """
         Clean and normalize text
@@ -0,0 +1,74 @@
+"""
+Tests for audit logger
+"""
+
+import pytest
+import sys
+import json
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.audit import AuditLogger
+
+
+class TestAuditLogger:
+    """Tests for AuditLogger"""
+    
+    def _read_events(self, log_dir):
+        """Return (prefix, json payload) pairs from the audit log files"""
+        events = []
+        for log_file in Path(log_dir).glob("audit_*.log"):
+            for line in log_file.read_text(encoding='utf-8').splitlines():
+                message = line.split(" | ", 2)[-1]
+                if ": {" in message:
+                    prefix, payload = message.split(": ", 1)
+                    events.append((prefix, payload))
+        return events
+    
+    def test_async_logging_flush(self, tmp_path):
+        """Test that queued events are written with valid checksums after flush()"""
+        audit = AuditLogger(log_dir=str(tmp_path), async_logging=True)
+        
+        for i in range(20):
+            audit.log_document_ingestion(file_name=f"doc_{i}.txt", num_chunks=i)
+        audit.log_query(query_id="q1", num_results=3, retrieval_time=0.1, generation_time=0.2)
+        audit.flush()
+        
+        events = self._read_events(tmp_path)
+        assert len(events) == 21
+        assert all(audit.verify_log_integrity(payload) for _, payload in events)
+        assert [json.loads(p)['file_name'] for _, p in events[:20]] == [f"doc_{i}.txt" for i in range(20)]
+    
+    def test_async_write_failure_reported(self, tmp_path, capsys):
+        """Test that a failed background write is reported instead of dropped"""
+        audit = AuditLogger(log_dir=str(tmp_path), async_logging=True)
+        
+        audit.log_system_event('bad_event', {'value': object()})
+        audit.flush()
+        
+        assert "bad_event" in capsys.readouterr().err
+    
+
+    def test_async_loggers_share_writer(self, tmp_path):
+        """Test that async loggers share one writer thread and can be freed"""
+        import gc
+        import threading
+        import weakref
+        
+        loggers = [AuditLogger(log_dir=str(tmp_path), async_logging=True) for _ in range(3)]
+        for audit in loggers:
+            audit.log_security_event("shared writer")
+        loggers[0].flush()
+        
+        writers = [t for t in threading.enumerate() if t.name == 'audit-logger']
+        assert len(writers) == 1
+        
+        ref = weakref.ref(loggers[0])
+        del audit, loggers
+        gc.collect()
+        assert ref() is None
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -74,6 +74,64 @@ class TestDocumentProcessor:
         assert all('file_path' in chunk for chunk in chunks)
         assert all(chunk['source'] == 'test.txt' for chunk in chunks)
     
+    def test_parse_cache(self, tmp_path):
+        """Test that parsed text is cached by content hash"""
+        cache_dir = tmp_path / "cache"
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("Cached document content.", encoding='utf-8')
+        
+        processor = DocumentProcessor(cache_dir=str(cache_dir))
+        content = processor.load_document(str(test_file))
+        
+        cache_files = list(cache_dir.iterdir())
+        assert len(cache_files) == 1
+        assert cache_files[0].read_text(encoding='utf-8') == content
+        
+        # A copy with identical content elsewhere is served from the cache
+        moved_file = tmp_path / "moved.txt"
+        moved_file.write_text("Cached document content.", encoding='utf-8')
+        cache_files[0].write_text("from cache", encoding='utf-8')
+        assert processor.load_document(str(moved_file)) == "from cache"
+    
+    def test_parse_cache_concurrent(self, tmp_path, monkeypatch):
+        """Test that threads parsing identical files share the cache safely"""
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+        
+        # Slow parsing so all threads miss the cache and write together
+        parse = DocumentProcessor._parse
+        def slow_parse(self, data, file_extension):
+            time.sleep(0.01)
+            return parse(self, data, file_extension)
+        monkeypatch.setattr(DocumentProcessor, '_parse', slow_parse)
+        
+        paths = []
+        for i in range(16):
+            path = tmp_path / f"same_{i}.txt"
+            path.write_text("Identical content.", encoding='utf-8')
+            paths.append(str(path))
+        
+        for trial in range(5):
+            cache_dir = tmp_path / f"cache_{trial}"
+            processor = DocumentProcessor(cache_dir=str(cache_dir))
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                contents = list(pool.map(processor.load_document, paths))
+            
+            assert len(set(contents)) == 1
+            assert [p.suffix for p in cache_dir.iterdir()] == ['.txt']
+    
+    def test_list_documents(self, tmp_path):
+        """Test recursive document discovery"""
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "small.txt").write_text("a", encoding='utf-8')
+        (tmp_path / "sub" / "large.MD").write_text("b" * 100, encoding='utf-8')
+        (tmp_path / "skip.xyz").write_text("c", encoding='utf-8')
+        
+        processor = DocumentProcessor()
+        files = processor.list_documents(str(tmp_path))
+        
+        assert [Path(f).name for f in files] == ["large.MD", "small.txt"]
+    
     def test_unsupported_format(self, tmp_path):
         """Test unsupported file format"""
         test_file = tmp_path / "test.xyz"
@@ -0,0 +1,135 @@
+"""
+Tests for embedding model similarity helpers
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("sentence_transformers")
+
+from src.retrieval import EmbeddingModel
+
+
+@pytest.fixture
+def model():
+    """EmbeddingModel without loading weights; the similarity helpers need none"""
+    return EmbeddingModel.__new__(EmbeddingModel)
+
+
+class TestSimilarity:
+    """Tests for similarity scoring"""
+    
+    def test_similarity_int8_no_overflow(self, model):
+        """Test that large int8 vectors score like their float equivalents"""
+        a = np.array([100, 100, 100, 100], dtype=np.int8)
+        b = np.array([127, -127, 127, 127], dtype=np.int8)
+        
+        assert model.similarity(a, a) == pytest.approx(1.0)
+        assert model.similarity(a, b) == pytest.approx(
+            model.similarity(a.astype(np.float32), b.astype(np.float32))
+        )
+    
+    def test_batch_similarity_int8(self, model):
+        """Test int8 batch scoring on both the normalized and general paths"""
+        query = np.array([100, 100, 100, 100], dtype=np.int8)
+        embeddings = np.array([[100, 100, 100, 100], [127, -127, 127, -127]], dtype=np.int8)
+        
+        scores = model.batch_similarity(query, embeddings)
+        assert scores == pytest.approx([1.0, 0.0], abs=1e-6)
+        
+        dots = model.batch_similarity(query, embeddings, assume_normalized=True)
+        assert dots == pytest.approx([40000.0, 0.0])
+    
+
+    def test_batch_similarity_non_contiguous(self, model):
+        """Test strided, Fortran-order and column-sliced inputs"""
+        rng = np.random.default_rng(0)
+        base = rng.standard_normal((5, 8)).astype(np.float32)
+        query = rng.standard_normal(16).astype(np.float32)
+        expected = model.batch_similarity(query[::2].copy(), base)
+        
+        assert model.batch_similarity(query[::2], base) == pytest.approx(expected, abs=1e-5)
+        assert model.batch_similarity(query[::2].copy(), np.asfortranarray(base)) == pytest.approx(expected, abs=1e-5)
+        
+        wide = np.hstack([base, base])
+        assert model.batch_similarity(query[::2].copy(), wide[:, :8]) == pytest.approx(expected, abs=1e-5)
+    
+    def test_batch_similarity_zero_vectors(self, model, monkeypatch):
+        """Test that zero vectors score 0.0 on both the SimSIMD and NumPy paths"""
+        import src.retrieval.embedding_model as embedding_module
+        
+        query = np.ones(4, dtype=np.float32)
+        embeddings = np.array([[0, 0, 0, 0], [1, 1, 1, 1]], dtype=np.float32)
+        
+        for has_simsimd in (embedding_module._HAS_SIMSIMD, False):
+            monkeypatch.setattr(embedding_module, '_HAS_SIMSIMD', has_simsimd)
+            assert model.batch_similarity(query, embeddings) == pytest.approx([0.0, 1.0])
+            assert model.batch_similarity(np.zeros(4, dtype=np.float32), embeddings) == pytest.approx([0.0, 0.0])
+
+
+class TestEmbeddingCache:
+    """Tests for the SQLite document embedding cache"""
+    
+    def _cached_model(self, tmp_path, encoded, backend="torch"):
+        """EmbeddingModel with an on-disk cache and a stubbed, recording encode()"""
+        import sqlite3
+        import threading
+        
+        model = EmbeddingModel.__new__(EmbeddingModel)
+        model.model_name = "stub"
+        model.local_model_path = None
+        model.backend = backend
+        model.model_file_name = None
+        model.max_seq_length = 256
+        model.embedding_dim = 4
+        model._cache_lock = threading.Lock()
+        model._cache_db = sqlite3.connect(str(tmp_path / "embeddings.sqlite"), check_same_thread=False)
+        model._cache_db.execute('CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)')
+        
+        def encode(texts, batch_size=32, show_progress_bar=False, normalize=True):
+            encoded.extend(texts)
+            return np.array([_vector(text) for text in texts], dtype=np.float32)
+        model.encode = encode
+        return model
+    
+    def test_encode_documents_cache(self, tmp_path):
+        """Test that only misses are encoded and results keep input order"""
+        encoded = []
+        model = self._cached_model(tmp_path, encoded)
+        texts = [f"chunk {i}" for i in range(1200)]
+        
+        first = model.encode_documents(texts[:700])
+        assert encoded == texts[:700]
+        assert np.array_equal(first, [_vector(t) for t in texts[:700]])
+        
+        # Shuffled, with duplicates, spanning several 500-key lookups
+        encoded.clear()
+        order = np.random.default_rng(0).permutation(1200).tolist() + [3, 3, 900]
+        mixed = [texts[i] for i in order]
+        result = model.encode_documents(mixed)
+        
+        assert sorted(set(encoded)) == sorted(texts[700:])
+        assert np.array_equal(result, [_vector(t) for t in mixed])
+        
+        # A new instance on the same file hits for everything
+        encoded.clear()
+        again = self._cached_model(tmp_path, encoded).encode_documents(mixed)
+        assert encoded == []
+        assert np.array_equal(again, result)
+        
+        # A different backend must not reuse these vectors
+        self._cached_model(tmp_path, encoded, backend="onnx").encode_documents(texts[:2])
+        assert encoded == texts[:2]
+
+
+def _vector(text):
+    """Deterministic fake embedding for a text"""
+    return [len(text), sum(map(ord, text)) % 97, text.count("1"), 1.0]
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
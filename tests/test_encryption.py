@@ -23,6 +23,14 @@ class TestKeyManager:
         assert len(key) == 32  # 256 bits
         assert isinstance(key, bytes)
     
+    def test_generate_keys(self):
+        """Test bulk key generation"""
+        keys = KeyManager().generate_keys(5)
+        
+        assert len(keys) == 5
+        assert all(len(key) == 32 for key in keys)
+        assert len(set(keys)) == 5
+    
     def test_save_and_load_key(self, tmp_path):
         """Test saving and loading key"""
         key_file = tmp_path / "test.key"
@@ -33,6 +41,17 @@ class TestKeyManager:
         
         assert original_key == loaded_key
     
+    def test_load_key_after_overwrite(self, tmp_path):
+        """Test that cached keys are refreshed when the key file changes"""
+        key_file = tmp_path / "test.key"
+        key_manager = KeyManager(str(key_file))
+        
+        key_manager.generate_and_save_key()
+        key_manager.load_key()
+        new_key = key_manager.generate_and_save_key()
+        
+        assert KeyManager(str(key_file)).load_key() == new_key
+    
     def test_key_exists(self, tmp_path):
         """Test key existence check"""
         key_file = tmp_path / "test.key"
@@ -55,6 +74,18 @@ class TestKeyManager:
         # Same password with same salt should produce same key
         key2, _ = KeyManager.derive_key_from_password(password, salt1)
         assert key1 == key2
+    
+    def test_derive_key_matches_cryptography_pbkdf2(self):
+        """Test that derived keys match the cryptography PBKDF2HMAC output"""
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+        
+        password = "cross_check_password"
+        salt = bytes(range(16))
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=100000)
+        
+        key, _ = KeyManager.derive_key_from_password(password, salt)
+        assert key == kdf.derive(password.encode())
 
 
 class TestEncryptionManager:
@@ -92,6 +123,21 @@ class TestEncryptionManager:
         
         decrypted = enc_manager.decrypt_from_base64(encrypted_b64)
         assert decrypted == plaintext
+        
+        # Large payloads take the in-place buffer path
+        large_text = "x" * (EncryptionManager.ENCRYPT_INTO_THRESHOLD + 1)
+        assert enc_manager.decrypt_from_base64(enc_manager.encrypt_to_base64(large_text)) == large_text
+    
+    def test_encrypt_decrypt_raw(self, tmp_path):
+        """Test raw bytes encryption and decryption"""
+        key = KeyManager(str(tmp_path / "test.key")).generate_and_save_key()
+        enc_manager = EncryptionManager(key=key)
+        
+        plaintext = "Raw message 原始消息"
+        encrypted = enc_manager.encrypt_raw(plaintext)
+        
+        assert isinstance(encrypted, bytes)
+        assert enc_manager.decrypt_raw(encrypted) == plaintext
     
     def test_encrypt_batch(self, tmp_path):
         """Test batch encryption"""
@@ -108,6 +154,86 @@ class TestEncryptionManager:
         
         decrypted_batch = enc_manager.decrypt_batch(encrypted_batch)
         assert decrypted_batch == texts
+        
+        cached_batch = enc_manager.encrypt_batch(texts * 2, cache_plaintext=True)
+        assert enc_manager.decrypt_batch(cached_batch) == texts * 2
+    
+    def test_encrypt_batch_parallel(self, tmp_path):
+        """Test that threaded batch encryption preserves order"""
+        key = KeyManager(str(tmp_path / "test.key")).generate_and_save_key()
+        
+        enc_manager = EncryptionManager(key=key, max_workers=4)
+        
+        texts = [f"Text {i}" for i in range(EncryptionManager.PARALLEL_THRESHOLD * 2 + 1)]
+        encrypted_batch = enc_manager.encrypt_batch(texts)
+        
+        assert len(encrypted_batch) == len(texts)
+        assert enc_manager.decrypt_batch(encrypted_batch) == texts
+    
+    def test_encrypt_many(self, tmp_path):
+        """Test batch base64 encryption and per-item batch decryption"""
+        key = KeyManager(str(tmp_path / "test.key")).generate_and_save_key()
+        enc_manager = EncryptionManager(key=key, max_workers=4)
+        
+        texts = [f"Chunk {i} 文本" for i in range(EncryptionManager.PARALLEL_THRESHOLD + 1)]
+        encrypted = enc_manager.encrypt_many(texts)
+        
+        assert len(encrypted) == len(texts)
+        assert [enc_manager.decrypt_from_base64(e) for e in encrypted] == texts
+        assert enc_manager.encrypt_many([]) == []
+        
+        errors = {}
+        tampered = encrypted[:2] + ["AAAA" + encrypted[2][4:]]
+        assert enc_manager.decrypt_many(tampered, errors=errors) == texts[:2] + [None]
+        assert list(errors) == [2]
+    
+    def test_encrypt_decrypt_file(self, tmp_path):
+        """Test file encryption round trip"""
+        key = KeyManager(str(tmp_path / "test.key")).generate_and_save_key()
+        enc_manager = EncryptionManager(key=key)
+        
+        plain_file = tmp_path / "plain.txt"
+        plain_file.write_bytes("File content 文件内容".encode('utf-8'))
+        enc_file = tmp_path / "plain.enc"
+        out_file = tmp_path / "out.txt"
+        
+        enc_manager.encrypt_file(str(plain_file), str(enc_file))
+        assert enc_file.read_bytes() != plain_file.read_bytes()
+        
+        enc_manager.decrypt_file(str(enc_file), str(out_file))
+        assert out_file.read_bytes() == plain_file.read_bytes()
+    
+    def test_encrypt_file_frames(self, tmp_path, monkeypatch):
+        """Test multi-frame file encryption and truncation detection"""
+        key = KeyManager(str(tmp_path / "test.key")).generate_and_save_key()
+        enc_manager = EncryptionManager(key=key)
+        monkeypatch.setattr(EncryptionManager, 'FILE_CHUNK_SIZE', 16)
+        
+        plain_file = tmp_path / "plain.bin"
+        plain_file.write_bytes(bytes(range(256)) * 3)
+        enc_file = tmp_path / "plain.enc"
+        out_file = tmp_path / "out.bin"
+        
+        enc_manager.encrypt_file(str(plain_file), str(enc_file))
+        enc_manager.decrypt_file(str(enc_file), str(out_file))
+        assert out_file.read_bytes() == plain_file.read_bytes()
+        
+        # Dropping the final frame must not decrypt to a shorter file
+        frame_size = 12 + 4 + 16 + 16
+        enc_file.write_bytes(enc_file.read_bytes()[:-frame_size])
+        with pytest.raises(ValueError, match="truncated"):
+            enc_manager.decrypt_file(str(enc_file), str(tmp_path / "partial.bin"))
+        
+        # Frames that did authenticate are not left behind as partial plaintext
+        assert not (tmp_path / "partial.bin").exists()
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["out.bin", "plain.bin", "plain.enc", "test.key"]
+        
+        # An oversized length in the unauthenticated header is rejected up front
+        data = bytearray(enc_file.read_bytes())
+        data[12:16] = (0xFFFFFFFF).to_bytes(4, 'little')
+        enc_file.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="exceeds"):
+            enc_manager.decrypt_file(str(enc_file), str(out_file))
     
     def test_different_nonces(self, tmp_path):
         """Test that different encryptions produce different nonces"""
@@ -123,6 +249,23 @@ class TestEncryptionManager:
         
         assert nonce1 != nonce2
         assert ciphertext1 != ciphertext2
+    
+    def test_nonce_pool_refill(self):
+        """Test that nonces stay unique across pool refills"""
+        from src.encryption.encryption_manager import _NoncePool
+        
+        pool = _NoncePool(batch=4)
+        nonces = [pool.next() for _ in range(10)]
+        
+        assert all(len(nonce) == 12 for nonce in nonces)
+        assert len(set(nonces)) == len(nonces)
+        
+        # Bulk draws, both within and larger than one refill
+        for count in (3, 9):
+            block = pool.take(count)
+            assert len(block) == 12 * count
+            nonces.extend(block[i:i + 12] for i in range(0, len(block), 12))
+        assert len(set(nonces)) == len(nonces)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,104 @@
+"""
+Tests for LLM client
+"""
+
+import pytest
+import sys
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import requests
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.generation import LLMClient
+
+
+def _response(status_code=200, body=None):
+    """Fake requests.Response carrying a JSON body"""
+    response = MagicMock(status_code=status_code)
+    response.content = json.dumps(body or {}).encode()
+    return response
+
+
+class TestLLMClient:
+    """Tests for LLMClient with a mocked HTTP session"""
+    
+    def test_check_connection_caches_success(self):
+        """Test that a healthy server is cached for conn_ttl"""
+        client = LLMClient(conn_ttl=60)
+        client._session = MagicMock()
+        client._session.get.return_value = _response(200)
+        
+        assert client.check_connection()
+        assert client.check_connection()
+        assert client._session.get.call_count == 1
+    
+    def test_check_connection_retries_failure(self):
+        """Test that a failed check is not cached, so a restarted server is seen"""
+        client = LLMClient(conn_ttl=60)
+        client._session = MagicMock()
+        client._session.get.side_effect = [
+            requests.exceptions.ConnectionError("down"),
+            _response(200)
+        ]
+        
+        assert not client.check_connection()
+        assert client.check_connection()
+        assert client._session.get.call_count == 2
+    
+    def test_check_connection_ttl_expiry(self, monkeypatch):
+        """Test that the cached result expires after conn_ttl"""
+        import src.generation.llm_client as llm_module
+        
+        now = [1000.0]
+        monkeypatch.setattr(llm_module.time, 'monotonic', lambda: now[0])
+        client = LLMClient(conn_ttl=10)
+        client._session = MagicMock()
+        client._session.get.return_value = _response(200)
+        
+        client.check_connection()
+        now[0] += 11
+        client.check_connection()
+        assert client._session.get.call_count == 2
+    
+    def test_generate_batch(self):
+        """Test that batched generation keeps prompt order and sends each context"""
+        client = LLMClient(max_workers=4)
+        client._session = MagicMock()
+        
+        # Echo the prompt back so each answer shows what was sent for it
+        def post(url, json=None, timeout=None):
+            return _response(200, {'response': json['prompt']})
+        client._session.post.side_effect = post
+        
+        prompts = [f"question {i}" for i in range(8)]
+        contexts = [[f"chunk {i}"] for i in range(8)]
+        answers = client.generate_batch(prompts, contexts)
+        
+        assert len(answers) == 8
+        for i, answer in enumerate(answers):
+            assert f"question {i}" in answer
+            assert f"chunk {i}" in answer
+        
+        with pytest.raises(ValueError):
+            client.generate_batch(prompts, contexts[:2])
+
+    
+    def test_non_json_response(self):
+        """Test that a non-JSON body is reported as ConnectionError"""
+        client = LLMClient()
+        client._session = MagicMock()
+        response = MagicMock(status_code=502)
+        response.content = b"<html>Bad Gateway</html>"
+        client._session.post.return_value = response
+        
+        with pytest.raises(ConnectionError):
+            client.generate("question")
+        with pytest.raises(ConnectionError):
+            client.chat([{'role': 'user', 'content': 'question'}])
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,234 @@
+"""
+Tests for the RAG system pipeline (in-memory Qdrant, fake encoder, mocked LLM)
+"""
+
+import pytest
+import sys
+import json
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import yaml
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("sentence_transformers")
+
+from src.rag_system import PrivacyEnhancedRAG
+from src.generation import LLMClient
+
+
+class FakeEncoder:
+    """Keyword-count embeddings: texts sharing a keyword land close together"""
+    
+    KEYWORDS = ('alpha', 'delta', 'omega')
+    DIM = 8
+    
+    def _embed(self, texts):
+        vectors = np.zeros((len(texts), self.DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            lowered = text.lower()
+            for j, keyword in enumerate(self.KEYWORDS):
+                vectors[i, j] = lowered.count(keyword)
+            vectors[i, -1] = 0.1
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    
+    def encode(self, texts, batch_size=32, **kwargs):
+        return self._embed([texts] if isinstance(texts, str) else texts)
+    
+    def encode_documents(self, texts, batch_size=32, **kwargs):
+        return self._embed(texts)
+    
+    def get_embedding_dimension(self):
+        return self.DIM
+
+
+def _dumps(obj):
+    """JSON-encode a fake response body"""
+    return json.dumps(obj).encode()
+
+
+@pytest.fixture
+def rag(tmp_path):
+    """RAG system wired to an in-memory collection and an echoing LLM"""
+    config = {
+        'encryption': {'key_file': str(tmp_path / "test.key")},
+        'vector_db': {'qdrant': {'collection': 'test', 'storage_path': ':memory:', 'vector_size': FakeEncoder.DIM}},
+        'audit': {'log_dir': str(tmp_path / "logs")},
+        'retrieval': {'top_k': 2, 'score_threshold': 0.5},
+        'document_processing': {'chunk_size': 60, 'chunk_overlap': 10}
+    }
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump(config), encoding='utf-8')
+    
+    system = PrivacyEnhancedRAG(config_path=str(config_path))
+    system.__dict__['embedding_model'] = FakeEncoder()
+    
+    # Echo the prompt so answers show which question and context were sent
+    llm_client = LLMClient()
+    llm_client._session = MagicMock()
+    
+    def post(url, json=None, timeout=None):
+        response = MagicMock(status_code=200)
+        response.content = _dumps({'response': json['prompt']})
+        return response
+    llm_client._session.post.side_effect = post
+    system.__dict__['llm_client'] = llm_client
+    return system
+
+
+def _point_count(system):
+    store = system.vector_store
+    return store.client.count(collection_name=store.collection_name).count
+
+
+def _write_docs(tmp_path):
+    docs = tmp_path / "docs"
+    (docs / "sub").mkdir(parents=True)
+    (docs / "a.txt").write_text("Alpha beta gamma. " * 20, encoding='utf-8')
+    (docs / "sub" / "b.txt").write_text("Delta epsilon zeta. " * 8, encoding='utf-8')
+    return docs
+
+
+class TestIngestion:
+    """Tests for batched ingestion"""
+    
+    def test_failed_batch_rolls_back(self, rag, tmp_path):
+        """Test that a failure mid-ingest leaves no points behind"""
+        docs = _write_docs(tmp_path)
+        rag.INGEST_BATCH_SIZE = 2
+        
+        add_documents = rag.vector_store.add_documents
+        calls = []
+        
+        def flaky_add(**kwargs):
+            calls.append(1)
+            if len(calls) == 3:
+                raise RuntimeError("store unavailable")
+            return add_documents(**kwargs)
+        rag.vector_store.add_documents = flaky_add
+        
+        with pytest.raises(RuntimeError):
+            rag.ingest_document(str(docs / "a.txt"))
+        assert len(calls) == 3
+        assert _point_count(rag) == 0
+        
+        with pytest.raises(RuntimeError):
+            calls.clear()
+            rag.ingest_directory(str(docs))
+        assert _point_count(rag) == 0
+    
+    def test_ingest_directory_ids_per_file(self, rag, tmp_path):
+        """Test that each file's document_ids point at that file's chunks, in order"""
+        docs = _write_docs(tmp_path)
+        rag.INGEST_BATCH_SIZE = 3
+        
+        results = rag.ingest_directory(str(docs))
+        
+        assert len(results) == 2
+        store = rag.vector_store
+        for file_path, result in results.items():
+            assert result['status'] == 'success'
+            assert len(result['document_ids']) == result['num_chunks']
+            points = store.client.retrieve(
+                collection_name=store.collection_name,
+                ids=result['document_ids'],
+                with_payload=True
+            )
+            by_id = {str(point.id): point.payload for point in points}
+            payloads = [by_id[doc_id] for doc_id in result['document_ids']]
+            assert all(payload['file_path'] == file_path for payload in payloads)
+            assert [payload['chunk_id'] for payload in payloads] == list(range(result['num_chunks']))
+        assert _point_count(rag) == sum(r['num_chunks'] for r in results.values())
+
+
+class TestQuery:
+    """Tests for querying"""
+    
+    def test_query_batch_order(self, rag, tmp_path):
+        """Test that batched answers and sources line up with their questions"""
+        rag.ingest_directory(str(_write_docs(tmp_path)))
+        
+        questions = ["Tell me about delta?", "What is alpha?", "Omega?", "Alpha and alpha?"]
+        results = rag.query_batch(questions)
+        
+        assert len(results) == len(questions)
+        assert set(results[0]['sources']) == {'b.txt'}
+        assert set(results[1]['sources']) == {'a.txt'}
+        assert results[2]['retrieved_chunks'] == 0
+        assert set(results[3]['sources']) == {'a.txt'}
+        for question, result in zip(questions[:2] + questions[3:], results[:2] + results[3:]):
+            assert question in result['answer']
+        assert "Delta epsilon" in results[0]['answer']
+        assert "Alpha beta" in results[1]['answer']
+    
+    
+    def test_plaintext_cache(self, rag):
+        """Test cache hits, LRU order, eviction and decrypt audit counts"""
+        texts = [f"chunk {i}" for i in range(5)]
+        ciphertexts = rag.encryption_manager.encrypt_many(texts)
+        hits = [
+            {'id': i, 'encrypted_text': ct, 'metadata': {'source': f"doc{i}.txt"}}
+            for i, ct in enumerate(ciphertexts)
+        ]
+        
+        decrypted = []
+        decrypt_many = rag.encryption_manager.decrypt_many
+        def counting_decrypt(items, errors=None):
+            decrypted.append(len(items))
+            return decrypt_many(items, errors=errors)
+        rag.encryption_manager.decrypt_many = counting_decrypt
+        rag.audit_logger.log_encryption_operation = MagicMock()
+        rag._plaintext_cache_size = 3
+        
+        _, context, sources = rag._decrypt_hits(hits[:3])
+        assert context == texts[:3]
+        assert sources == ["doc0.txt", "doc1.txt", "doc2.txt"]
+        
+        # A hit is served from the cache and becomes most recently used
+        assert rag._decrypt_hits(hits[:1])[1] == texts[:1]
+        assert list(rag._plaintext_cache) == [1, 2, 0]
+        
+        # A new miss evicts the least recently used entry
+        assert rag._decrypt_hits(hits[3:4])[1] == texts[3:4]
+        assert list(rag._plaintext_cache) == [2, 0, 3]
+        
+        assert decrypted == [3, 1]
+        logged = [call.kwargs['num_items'] for call in rag.audit_logger.log_encryption_operation.call_args_list]
+        assert logged == [3, 0, 1]
+        
+        # Failed decryptions are neither returned, cached nor counted
+        tampered = dict(hits[4], encrypted_text="AAAA" + ciphertexts[4][4:])
+        assert rag._decrypt_hits([hits[2], tampered])[1] == texts[2:3]
+        assert 4 not in rag._plaintext_cache
+        assert rag.audit_logger.log_encryption_operation.call_args.kwargs == {
+            'operation': 'decrypt', 'num_items': 0, 'success': False
+        }
+    
+    def test_plaintext_cache_disabled(self, rag):
+        """Test that plaintext_cache_size 0 decrypts every time and caches nothing"""
+        ciphertexts = rag.encryption_manager.encrypt_many(["a", "b"])
+        hits = [{'id': i, 'encrypted_text': ct, 'metadata': {}} for i, ct in enumerate(ciphertexts)]
+        rag._plaintext_cache_size = 0
+        
+        for _ in range(2):
+            assert rag._decrypt_hits(hits)[1] == ["a", "b"]
+            assert len(rag._plaintext_cache) == 0
+    
+    def test_format_context_budget(self, rag):
+        """Test that max_context_chars truncates chunks but never empties them"""
+        chunks = ["a" * 50, "b" * 50, "c" * 50]
+        
+        rag.retrieval_config['max_context_chars'] = 60
+        assert rag._format_context(chunks) == "[1] " + "a" * 20 + "\n\n[2] " + "b" * 20 + "\n\n[3] " + "c" * 20
+        
+        rag.retrieval_config['max_context_chars'] = 2
+        assert rag._format_context(chunks) == "[1] a\n\n[2] b\n\n[3] c"
+        
+        rag.retrieval_config.pop('max_context_chars')
+        assert "a" * 50 in rag._format_context(chunks)
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,72 @@
+"""
+Tests for vector store (in-memory Qdrant)
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# src.retrieval also exports EmbeddingModel
+pytest.importorskip("sentence_transformers")
+
+from src.retrieval import VectorStore
+
+
+@pytest.fixture
+def store():
+    """Four-dimensional in-memory collection"""
+    return VectorStore(collection_name="test", path=":memory:", vector_size=4)
+
+
+class TestVectorStore:
+    """Tests for VectorStore"""
+    
+    def test_add_search_delete(self, store):
+        """Test add_documents -> search_batch -> delete_documents"""
+        embeddings = np.eye(4, dtype=np.float32)[:3]
+        ids = store.add_documents(
+            embeddings=embeddings,
+            encrypted_texts=["ct0", "ct1", "ct2"],
+            metadata=[{'source': f"doc{i}.txt", 'chunk_id': i} for i in range(3)],
+            batch_size=2
+        )
+        
+        assert len(ids) == len(set(ids)) == 3
+        
+        queries = np.array([[0, 1, 0, 0], [1, 0, 0, 0]], dtype=np.float32)
+        results = store.search_batch(queries, top_k=1, score_threshold=0.5)
+        assert [r[0]['encrypted_text'] for r in results] == ["ct1", "ct0"]
+        assert [r[0]['id'] for r in results] == [ids[1], ids[0]]
+        assert results[0][0]['metadata'] == {'source': "doc1.txt", 'chunk_id': 1}
+        assert results[0][0]['nonce'] is None
+        assert store.search_batch(np.empty((0, 4), dtype=np.float32)) == []
+        
+        # Single-query search formats results the same way
+        assert store.search(queries[0], top_k=1, score_threshold=0.5) == results[0]
+        
+        store.delete_documents(ids[:2])
+        results = store.search_batch(queries, top_k=3, score_threshold=0.5)
+        assert results == [[], []]
+        assert store.client.count(collection_name="test").count == 1
+    
+    def test_add_documents_nonces_and_validation(self, store):
+        """Test optional nonces and mismatched input lengths"""
+        store.add_documents([np.ones(4, dtype=np.float32)], ["ct"], nonces=["n0"])
+        
+        result = store.search(np.ones(4, dtype=np.float32), top_k=1)[0]
+        assert result['nonce'] == "n0"
+        assert store.add_documents([], []) == []
+        
+        with pytest.raises(ValueError):
+            store.add_documents([np.ones(4, dtype=np.float32)], ["a", "b"])
+        with pytest.raises(ValueError):
+            store.add_documents([np.ones(4, dtype=np.float32)], ["a"], nonces=[])
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])